@@ -1,27 +1,15 @@
 
 import os
-import pandas as pd
 import networkx as nx
-from itertools import combinations
+from graph_store import load_editor_graph
+from bipartite import BipartiteEditorNetwork
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.tracing import stage, describe
+from common.rendering import cached_layout, draw_graph, graph_arrays, show
 import matplotlib.pyplot as plt
 import os
 
-def load_data(file_path):
-    df = pd.read_csv(file_path)
-    return df[['page_name', 'thread_subject', 'username']]
-
-def build_editor_network(df):
-    G = nx.Graph()
-    grouped = df.groupby(['page_name', 'thread_subject'])
-    for _, group in grouped:
-        users =- group['username'].dropna().unique()
-        for u1, u2 in combinations(users, 2):
-            if G.has_edge(u1, u2):
-                G[u1][u2]['weight'] += 1
-            else:
-                G.add_edge(u1, u2, weight=1)
-    return G
-
 def analyze_graph(G, dataset_name):
     print(f"\n--- {dataset_name} ---")
     print(f"Number of nodes: {G.number_of_nodes()}")
@@ -30,17 +18,28 @@ def analyze_graph(G, dataset_name):
     print(f"Average degree: {avg_degree:.2f}")
     print(f"Density: {nx.density(G):.5f}")
 
-def visualize_subgraph(G, dataset_name, max_nodes=50, save_path=None):
-    import matplotlib.pyplot as plt
+def analyze_bipartite(net, dataset_name):
+    """Same summary computed on the user-thread incidence, without materializing the projection."""
+    print(f"\n--- {dataset_name} (bipartite) ---")
+    n, m = net.n_users, net.number_of_edges()
+    print(f"Number of nodes: {n}")
+    print(f"Number of edges: {m}")
+    print(f"Average degree: {2 * m / n if n else 0.0:.2f}")
+    print(f"Density: {2 * m / (n * (n - 1)) if n > 1 else 0.0:.5f}")
+    print(f"Connected components: {net.connected_components()[0]}")
+    print(f"Average clustering (sampled): {net.average_clustering(n_samples=300, seed=42):.4f}")
 
+def visualize_subgraph(G, dataset_name, max_nodes=50, save_path=None):
     sub_nodes = list(G.nodes)[:max_nodes]
     subgraph = G.subgraph(sub_nodes)
 
-    plt.figure(figsize=(10, 8))
-    pos = nx.spring_layout(subgraph, seed=42)
-    nx.draw_networkx_nodes(subgraph, pos, node_size=300, node_color='lightblue')
-    nx.draw_networkx_edges(subgraph, pos, alpha=0.5)
-    nx.draw_networkx_labels(subgraph, pos, font_size=8)
+    fig, ax = plt.subplots(figsize=(10, 8))
+    # Spring layout is computed once per subgraph and stored under cache/layouts
+    pos = cached_layout(subgraph, seed=42)
+    _, xy, segments = graph_arrays(subgraph, pos)
+    draw_graph(ax, xy, segments, node_size=300, node_color='lightblue', edge_color='black', edge_alpha=0.5,
+               linewidth=1.0)
+    nx.draw_networkx_labels(subgraph, pos, font_size=8, ax=ax)
     plt.title(f"{dataset_name} Subgraph Visualization (Top {max_nodes} Users)", fontsize=14)
     plt.axis('off')
     plt.tight_layout()
@@ -49,10 +48,10 @@ def visualize_subgraph(G, dataset_name, max_nodes=50, save_path=None):
         plt.savefig(save_path, dpi=300)
         print(f"The figure has been saved to: {save_path}")
 
-    plt.show()
+    show(fig)
 
 
-def main():
+def main(bipartite=False, max_thread_size=None):
     data_dir = "../Datasets"
     datasets = {
         "PROJECT_CHAT": os.path.join(data_dir, "PROJECT_CHAT.csv"),
@@ -63,8 +62,14 @@ def main():
     graphs = {}
 
     for name, path in datasets.items():
-        df = load_data(path)
-        G = build_editor_network(df)
+        if bipartite:
+            # Large threads are never expanded into all their user pairs
+            graphs[name] = BipartiteEditorNetwork.from_csv(path, max_thread_size=max_thread_size)
+            analyze_bipartite(graphs[name], name)
+            continue
+        with stage("build_editor_network", dataset=name) as s:
+            G = load_editor_graph(path)
+            s.record(**describe(G))
         analyze_graph(G, name)
         graphs[name] = G
 
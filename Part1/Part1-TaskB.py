@@ -1,112 +1,141 @@
 import pandas as pd
-import networkx as nx
-from itertools import combinations
+from editor_network import graph_to_csr, load_data
+from graph_store import load_editor_graph
+from path_metrics import largest_component, exact_diameter, sampled_path_length
+from null_models import average_clustering, small_world_ensemble
+from temporal import monthly_snapshots
 import os
+import argparse
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.tracing import stage, traced, describe, write_trace
+from concurrent.futures import ProcessPoolExecutor
 
 # Display full DataFrame output
 pd.set_option('display.max_columns', None)
 pd.set_option('display.width', 1000)
 
-# === Step 1: Load data ===
-def load_data(file_path):
-    df = pd.read_csv(file_path)
-    return df[['page_name', 'thread_subject', 'username']]
-
-# === Step 2: Build user co-occurrence network based on threads ===
-def build_editor_network(df):
-    G = nx.Graph()
-    grouped = df.groupby(['page_name', 'thread_subject'])
-    for _, group in grouped:
-        users = group['username'].dropna().unique()
-        for u1, u2 in combinations(users, 2):
-            if G.has_edge(u1, u2):
-                G[u1][u2]['weight'] += 1
-            else:
-                G.add_edge(u1, u2, weight=1)
-    return G
+# === Steps 1-2: Load data and build the user co-occurrence network ===
+# Shared by all Part1 tasks and cached on disk, see editor_network.py and graph_store.py
 
 # === Step 3: Compute network structure metrics ===
-def analyze_network_metrics(G):
+@traced()
+def analyze_network_metrics(G, n_sources=300, workers=1, seed=42):
     metrics = {}
-    largest_cc = max(nx.connected_components(G), key=len)
-    G_cc = G.subgraph(largest_cc)
+    A, _ = graph_to_csr(G)
+    A_cc, _, num_components = largest_component(A)
 
-    # Approximate average path length (sampling)
-    sample_nodes = list(G_cc.nodes())[:300]
-    path_lengths = []
-    for node in sample_nodes:
-        lengths = nx.single_source_shortest_path_length(G_cc, node)
-        path_lengths.extend(lengths.values())
-    metrics['avg_path_length'] = sum(path_lengths) / len(path_lengths)
+    # Average path length from uniformly sampled BFS sources (with confidence interval)
+    path_length = sampled_path_length(A_cc, n_sources=n_sources, seed=seed, workers=workers)
+    metrics['avg_path_length'] = path_length['mean']
+    metrics['avg_path_length_ci'] = (round(path_length['ci_low'], 4), round(path_length['ci_high'], 4))
 
     # Additional metrics
-    metrics['diameter'] = nx.diameter(G_cc)
-    metrics['avg_clustering'] = nx.average_clustering(G)
-    metrics['is_connected'] = nx.is_connected(G)
-    metrics['num_components'] = nx.number_connected_components(G)
+    metrics['diameter'] = exact_diameter(A_cc)
+    metrics['avg_clustering'] = average_clustering(A)
+    metrics['is_connected'] = num_components == 1
+    metrics['num_components'] = num_components
     metrics['nodes'] = G.number_of_nodes()
     metrics['edges'] = G.number_of_edges()
     return metrics
 
-# === Step 4: Compare with random graph (small-world validation) ===
-def compare_with_random(G, seed=42):
-    n = G.number_of_nodes()
-    m = G.number_of_edges()
-    p = 2 * m / (n * (n - 1))  # edge density
-
-    original_cc = nx.average_clustering(G)
-    degrees = [d for _, d in G.degree()]
-    original_avg_deg = sum(degrees) / len(degrees)
-
-    R = nx.erdos_renyi_graph(n=n, p=p, seed=seed)
-    rand_cc = nx.average_clustering(R)
-    rand_deg = sum(dict(R.degree()).values()) / n
+# === Step 4: Compare with random graph ensembles (small-world validation) ===
+@traced()
+def compare_with_random(G, metrics, n_replicates=10, workers=1, seed=42):
+    A, _ = graph_to_csr(G)
+    original = {'clustering': metrics['avg_clustering'], 'path_length': metrics['avg_path_length']}
+    ensemble = small_world_ensemble(A, original, n_replicates=n_replicates, workers=workers, seed=seed)
+    gnm, config = ensemble['gnm'], ensemble['configuration']
 
     return {
-        "Original Clustering": round(original_cc, 4),
-        "Random Clustering": round(rand_cc, 4),
-        "Original Avg Degree": round(original_avg_deg, 2),
-        "Random Avg Degree": round(rand_deg, 2)
+        "Original Clustering": round(original['clustering'], 4),
+        "Random Clustering": round(gnm['clustering'], 4),
+        "Config Clustering": round(config['clustering'], 4),
+        "Original Avg Degree": round(2 * metrics['edges'] / metrics['nodes'], 2),
+        "Random Avg Degree": round(gnm['avg_degree'], 2),
+        "Sigma": round(config['sigma'], 2),
+        "Sigma Std": round(config['sigma_std'], 2),
+        "Omega": round(config['omega'], 3),
+        "Omega Std": round(config['omega_std'], 3)
     }
 
+# === Step 5: Monthly snapshots of the growing network (archive month from page_name) ===
+def temporal_metrics(path):
+    """Per-month cumulative metrics, each month added incrementally to the previous snapshot."""
+    with stage("load_data", path=path) as s:
+        df = load_data(path)
+        s.record(**describe(df))
+    snapshots, _ = monthly_snapshots(df)
+    return snapshots
+
+
+# === Per-dataset pipeline (runs in a worker process, returns compact records only) ===
+def process_dataset(name, path):
+    print(f"\n Processing dataset: {name}")
+    with stage("build_editor_network", dataset=name) as s:
+        G = load_editor_graph(path)
+        s.record(**describe(G))
+
+    # Network metrics
+    metrics = analyze_network_metrics(G)
+    metrics['dataset'] = name
+
+    # Random graph comparison
+    rand = compare_with_random(G, metrics)
+    rand['Dataset'] = name
+
+    # Monthly snapshots (datasets whose pages carry an archive month)
+    snapshots = temporal_metrics(path)
+    write_trace()  # pool workers do not run atexit handlers
+    return metrics, rand, snapshots
+
+
 # === Main execution ===
-def main():
+def main(extra_paths=(), workers=1):
     data_dir = "../Datasets"
     datasets = {
         "PROJECT_CHAT": os.path.join(data_dir, "PROJECT_CHAT.csv"),
         "PROPERTIES": os.path.join(data_dir, "PROPERTIES.csv"),
         "INTERWIKI_CONFLICT": os.path.join(data_dir, "INTERWIKI_CONFLICT.csv")
     }
-
-    results = []
-    random_comparison = []
-
-    for name, path in datasets.items():
-        print(f"\n Processing dataset: {name}")
-        df = load_data(path)
-        G = build_editor_network(df)
-
-        # Network metrics
-        metrics = analyze_network_metrics(G)
-        metrics['dataset'] = name
-        results.append(metrics)
-
-        # Random graph comparison
-        rand = compare_with_random(G)
-        rand['Dataset'] = name
-        random_comparison.append(rand)
+    for path in extra_paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        # Results are keyed by file name: two different files with the same name would overwrite each other
+        if name in datasets and os.path.abspath(datasets[name]) != os.path.abspath(path):
+            raise ValueError(f"Dataset name {name!r} is used by both {datasets[name]} and {path}; rename one")
+        datasets[name] = path
+
+    # Datasets are independent: fan them out across processes
+    names, paths = list(datasets), list(datasets.values())
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outputs = list(pool.map(process_dataset, names, paths))
+    else:
+        outputs = [process_dataset(name, path) for name, path in zip(names, paths)]
+
+    results = [metrics for metrics, _, _ in outputs]
+    random_comparison = [rand for _, rand, _ in outputs]
+    temporal = {name: snapshots for name, (_, _, snapshots) in zip(names, outputs) if len(snapshots)}
 
     # Output results
     df_metrics = pd.DataFrame(results)
     print("\n Task B - Core network structure metrics:")
     print(df_metrics[['dataset', 'nodes', 'edges', 'is_connected', 'num_components',
-                      'avg_path_length', 'diameter', 'avg_clustering']])
+                      'avg_path_length', 'avg_path_length_ci', 'diameter', 'avg_clustering']])
 
     df_compare = pd.DataFrame(random_comparison)
     print("\n Task B - Small-world validation (Original vs Random Graph):")
-    print(df_compare[['Dataset', 'Original Clustering', 'Random Clustering',
-                      'Original Avg Degree', 'Random Avg Degree']])
+    print(df_compare[['Dataset', 'Original Clustering', 'Random Clustering', 'Config Clustering',
+                      'Original Avg Degree', 'Random Avg Degree', 'Sigma', 'Sigma Std', 'Omega', 'Omega Std']])
 
-if __name__ == "__main__":
-    main()
+    for name, snapshots in temporal.items():
+        print(f"\n Task B - Monthly snapshots ({name}, last 12 months):")
+        print(snapshots.tail(12).to_string(index=False))
+    return df_metrics, df_compare
 
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Task B network metrics for the Part1 datasets")
+    parser.add_argument("csv", nargs="*", help="additional discussion CSVs (page_name, thread_subject, username)")
+    parser.add_argument("--workers", type=int, default=1, help="datasets processed in parallel")
+    args = parser.parse_args()
+    main(args.csv, workers=args.workers)
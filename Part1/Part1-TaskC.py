@@ -1,68 +1,48 @@
-import networkx as nx
 import random
 import matplotlib.pyplot as plt
-import pandas as pd
-from itertools import combinations
-
-def build_editor_network(df):
-    G = nx.Graph()
-    grouped = df.groupby(['page_name', 'thread_subject'])
-    for _, group in grouped:
-        users = group['username'].dropna().unique()
-        for u1, u2 in combinations(users, 2):
-            if G.has_edge(u1, u2):
-                G[u1][u2]['weight'] += 1
-            else:
-                G.add_edge(u1, u2, weight=1)
-    return G
+from editor_network import graph_to_csr
+from graph_store import load_editor_graph
+from centrality import top_k_priority
+from epidemic import sir_ensemble
+from spread import SpreadIndex
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.tracing import stage, traced, describe
+from common.rendering import show
 
 # === Spread probability estimation ===
-def calculate_spread_probability(G, node1, node2):
-    if nx.has_path(G, node1, node2):
-        shortest_path = nx.shortest_path_length(G, node1, node2)
-        return 1 / (shortest_path + 1)  # Shorter path → higher probability
-    return 0
+def calculate_spread_probabilities(G, pairs, index=None):
+    # Batch of (source, target) pairs: one BFS per distinct source, shorter path → higher probability
+    if index is None:
+        index = SpreadIndex(*graph_to_csr(G))
+    return index.probabilities(pairs)
 
-# === Generate priority check list ===
-def get_priority_list(G):
-    betweenness = nx.betweenness_centrality(G)
-    closeness = nx.closeness_centrality(G)
+def calculate_spread_probability(G, node1, node2, index=None):
+    return float(calculate_spread_probabilities(G, [(node1, node2)], index)[0])
 
-    scores = {node: (betweenness[node] + closeness[node]) / 2 for node in G.nodes()}
-    sorted_nodes = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-    return [node for node, _ in sorted_nodes]
+# === Generate priority check list ===
+@traced()
+def get_priority_list(G, k=10, epsilon=0.05, workers=1, seed=None):
+    # Top-k by (betweenness + closeness) / 2; betweenness is estimated from sampled pivots
+    A, names = graph_to_csr(G)
+    return top_k_priority(A, names, k=k, epsilon=epsilon, workers=workers, seed=seed)
 
 # === SIR model simulation ===
-def sir_simulation(G, initial_infected, beta=0.3, gamma=0.1, steps=10):
-    status = {node: "S" for node in G.nodes()}
-    for node in initial_infected:
-        status[node] = "I"
-
-    infected_counts = []
-
-    for _ in range(steps):
-        new_status = status.copy()
-
-        for node in G.nodes():
-            if status[node] == "I":
-                # Try to infect neighbors
-                for neighbor in G.neighbors(node):
-                    if status[neighbor] == "S" and random.random() < beta:
-                        new_status[neighbor] = "I"
-                # Recovery process
-                if random.random() < gamma:
-                    new_status[node] = "R"
-
-        status = new_status
-        infected_counts.append(sum(1 for s in status.values() if s == "I"))
-
-    return infected_counts
+@traced()
+def sir_simulation(G, initial_infected, beta=0.3, gamma=0.1, steps=10, runs=200, seed=None, workers=1):
+    # Many independent realizations at once; returns mean and quantile infection curves
+    A, names = graph_to_csr(G)
+    index = {name: i for i, name in enumerate(names)}
+    initial = [index[node] for node in initial_infected]
+    return sir_ensemble(A, initial, beta=beta, gamma=gamma, steps=steps, runs=runs, seed=seed, workers=workers)
 
 # === Main execution ===
 def main():
     data_path = "../Datasets/PROJECT_CHAT.csv"
-    df = pd.read_csv(data_path)
-    G = build_editor_network(df)
+    with stage("build_editor_network", path=data_path) as s:
+        G = load_editor_graph(data_path)
+        s.record(**describe(G))
 
     # Randomly select 2 users for spread probability estimation
     random_users = random.sample(list(G.nodes()), 2)
@@ -70,21 +50,28 @@ def main():
     print(f"Spread probability ({random_users[0]} → {random_users[1]}): {probability:.4f}")
 
     # Get priority user list
-    priority_list = get_priority_list(G)
-    print("Priority check list (Top 10):", priority_list[:10])
+    priority_list = get_priority_list(G, k=10)
+    print("Priority check list (Top 10):", [entry['node'] for entry in priority_list])
+    for entry in priority_list:
+        print(f"  {entry['node']}: {entry['score']:.4f} [{entry['score_low']:.4f}, {entry['score_high']:.4f}]")
 
     # Run SIR simulation
     initial_infected = random.sample(list(G.nodes()), 5)
     spread_results = sir_simulation(G, initial_infected)
 
-    # Plot infection curve
-    plt.plot(spread_results, marker='o')
+    # Plot infection curve distribution
+    steps = range(len(spread_results['mean']))
+    low, median, high = (spread_results['quantiles'][q] for q in (0.05, 0.5, 0.95))
+    plt.fill_between(steps, low, high, alpha=0.3, label="5-95% of runs")
+    plt.plot(steps, median, linestyle='--', label="Median")
+    plt.plot(steps, spread_results['mean'], marker='o', label="Mean")
+    plt.legend()
     plt.xlabel("Time Step")
     plt.ylabel("Number of Infected Nodes")
     plt.title("SIR Model Simulation")
     plt.tight_layout()
     plt.savefig("../results/1C_sir_infection_curve.png", dpi=300)
-    plt.show()
+    show()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,129 @@
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+from editor_network import encode_threads, incidence_from_codes, stream_threads
+
+ROW_CHUNK = 256  # users whose projection rows are materialized at once
+
+
+# === User-thread bipartite network with on-demand projection ===
+class BipartiteEditorNetwork:
+    """Editor network kept as its (threads x users) incidence matrix.
+
+    Projection metrics (degree, weighted degree, components, BFS distances,
+    clustering) are computed from the incidence matrix, so memory stays linear
+    in the number of posts; projection rows are only formed for small chunks of
+    users at a time.
+
+    Oversized threads can be dropped (`max_thread_size`) or down-weighted
+    (`weighting="newman"`: each thread adds 1 / (size - 1) to a pair instead of 1).
+    Nodes are the users that share a kept thread with someone else. `df` is either the
+    discussion rows or the (thread_codes, user_codes, n_threads, usernames) of `stream_threads`.
+    """
+
+    def __init__(self, df, max_thread_size=None, weighting="count"):
+        thread_codes, user_codes, n_threads, usernames = df if isinstance(df, tuple) else encode_threads(df)
+        B = incidence_from_codes(thread_codes, user_codes, n_threads, len(usernames))
+        sizes = np.diff(B.indptr)
+        keep = sizes >= 2
+        if max_thread_size is not None:
+            keep &= sizes <= max_thread_size
+        B = B[keep]
+        users = np.flatnonzero(np.diff(B.tocsc().indptr) > 0)
+        self.B = B[:, users].tocsr().astype(np.float64)
+        self.BT = self.B.T.tocsr()
+        self.usernames = np.asarray(usernames)[users]
+        self.thread_sizes = sizes[keep]
+        if weighting == "count":
+            self.thread_weights = np.ones(len(self.thread_sizes))
+        elif weighting == "newman":
+            self.thread_weights = 1.0 / (self.thread_sizes - 1)
+        else:
+            raise ValueError(f"Unknown weighting: {weighting}")
+        self.n_threads, self.n_users = self.B.shape
+
+    @classmethod
+    def from_csv(cls, file_path, **kwargs):
+        # Streamed in chunks: only the (thread, user) memberships are kept in memory
+        return cls(stream_threads(file_path), **kwargs)
+
+    def projection_rows(self, users):
+        """Weighted projection rows (len(users) x n_users CSR) without self-loops."""
+        users = np.asarray(users)
+        rows = (self.BT[users] @ sparse.diags(self.thread_weights) @ self.B).tocsr()
+        rows = rows.tocoo()
+        off = rows.col != users[rows.row]
+        return sparse.csr_matrix((rows.data[off], (rows.row[off], rows.col[off])), shape=rows.shape)
+
+    def _chunks(self):
+        for start in range(0, self.n_users, ROW_CHUNK):
+            yield np.arange(start, min(start + ROW_CHUNK, self.n_users))
+
+    # --- degrees ---
+    def weighted_degree(self):
+        """Sum of projection edge weights per user: each thread adds weight * (size - 1)."""
+        return self.BT @ (self.thread_weights * (self.thread_sizes - 1))
+
+    def degree(self):
+        """Number of distinct co-participants per user."""
+        return np.concatenate([np.zeros(0, dtype=np.int64)]
+                              + [np.diff(self.projection_rows(users).indptr) for users in self._chunks()])
+
+    def number_of_edges(self):
+        return int(self.degree().sum() // 2)
+
+    # --- connectivity and distances ---
+    def _bipartite_adjacency(self):
+        """(users + threads) square adjacency; user i is node i, thread t is node n_users + t."""
+        return sparse.bmat([[None, self.BT], [self.B, None]], format="csr")
+
+    def connected_components(self):
+        """(number of components, component label per user)."""
+        n, labels = csgraph.connected_components(self._bipartite_adjacency(), directed=False)
+        labels = labels[:self.n_users]
+        _, labels = np.unique(labels, return_inverse=True)
+        return int(labels.max()) + 1 if len(labels) else 0, labels
+
+    def bfs_distances(self, sources):
+        """Hop distances in the projection from each source user (len(sources) x n_users, inf if unreachable).
+
+        A user-thread-user step is one projection edge, so distances are half the bipartite ones.
+        """
+        H = self._bipartite_adjacency()
+        out = []
+        for start in range(0, len(sources), ROW_CHUNK):
+            d = csgraph.shortest_path(H, unweighted=True, indices=np.asarray(sources[start:start + ROW_CHUNK]))
+            out.append(d[:, :self.n_users] / 2)
+        return np.vstack(out) if out else np.empty((0, self.n_users))
+
+    # --- clustering ---
+    def local_clustering(self, users):
+        """Local clustering coefficient of the unweighted projection for the given users.
+
+        Links among a user's k neighbours are counted ROW_CHUNK neighbours at a time, so a
+        huge thread never materializes its k x k block.
+        """
+        out = np.zeros(len(users))
+        for i, u in enumerate(users):
+            neighbours = self.projection_rows([u]).indices
+            k = len(neighbours)
+            if k < 2:
+                continue
+            # Threads with at least two of the neighbours, as (threads x k) and (k x threads)
+            sub = self.B[:, neighbours]
+            sub = sub[np.diff(sub.indptr) >= 2]
+            subT = sub.T.tocsr()
+            links = 0
+            for start in range(0, k, ROW_CHUNK):
+                rows = (subT[start:start + ROW_CHUNK] @ sub).tocoo()
+                links += int(np.count_nonzero(rows.col != start + rows.row))
+            out[i] = links / (k * (k - 1))
+        return out
+
+    def average_clustering(self, n_samples=None, seed=None):
+        """Average clustering over all users, or an unbiased estimate from `n_samples` random users."""
+        if n_samples is None or n_samples >= self.n_users:
+            users = np.arange(self.n_users)
+        else:
+            users = np.random.default_rng(seed).choice(self.n_users, n_samples, replace=False)
+        return float(self.local_clustering(users).mean()) if len(users) else 0.0
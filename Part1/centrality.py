@@ -0,0 +1,149 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from path_metrics import BFS_CHUNK, bfs_distances
+
+SOURCE_BATCH = 128
+
+
+# === Brandes dependencies from one source, level-synchronous over CSR ===
+def _gather_neighbors(indptr, indices, frontier):
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(frontier, counts), indices[np.repeat(starts, counts) + offsets]
+
+
+def source_dependencies(indptr, indices, s):
+    """Brandes dependency delta_s(v) of source s on every node (unweighted)."""
+    n = len(indptr) - 1
+    dist = np.full(n, -1)
+    sigma = np.zeros(n)
+    dist[s], sigma[s] = 0, 1.0
+    frontier, level, dag = np.array([s]), 0, []
+    while frontier.size:
+        u, v = _gather_neighbors(indptr, indices, frontier)
+        fresh = v[dist[v] == -1]
+        dist[fresh] = level + 1
+        on_path = dist[v] == level + 1
+        u, v = u[on_path], v[on_path]
+        sigma += np.bincount(v, weights=sigma[u], minlength=n)
+        dag.append((u, v))
+        frontier, level = np.unique(fresh), level + 1
+
+    delta = np.zeros(n)
+    for u, v in reversed(dag):
+        delta += np.bincount(u, weights=sigma[u] / sigma[v] * (1 + delta[v]), minlength=n)
+    delta[s] = 0
+    return delta
+
+
+def _dependency_moments(A, sources):
+    """Sum and sum of squares of delta_s over a batch of sources."""
+    total = np.zeros(A.shape[0])
+    squares = np.zeros(A.shape[0])
+    for s in sources:
+        delta = source_dependencies(A.indptr, A.indices, int(s))
+        total += delta
+        squares += delta ** 2
+    return total, squares
+
+
+# === Closeness from multi-source BFS (Wasserman-Faust, as in networkx) ===
+def _closeness(A, nodes):
+    n = A.shape[0]
+    total, found = np.empty(len(nodes)), np.empty(len(nodes))
+    for start in range(0, len(nodes), BFS_CHUNK):
+        # Reduce each block of BFS rows right away; the full distance matrix is n x n
+        dist = bfs_distances(A, nodes[start:start + BFS_CHUNK])
+        reachable = np.isfinite(dist)
+        total[start:start + BFS_CHUNK] = np.where(reachable, dist, 0).sum(axis=1)
+        found[start:start + BFS_CHUNK] = reachable.sum(axis=1) - 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        closeness = np.where(total > 0, found / total * found / (n - 1), 0.0)
+    return closeness
+
+
+def closeness_centrality(A, workers=1, pool=None):
+    shards = np.array_split(np.arange(A.shape[0]), max(workers, 1))
+    if pool is None:
+        return np.concatenate([_closeness(A, shard) for shard in shards])
+    return np.concatenate(list(pool.map(_closeness, [A] * len(shards), shards)))
+
+
+# === Adaptive pivot sampling for betweenness ===
+def top_k_separated(score, bound, k):
+    """True when every top-k lower bound clears every other node's upper bound.
+
+    Scores carry half the betweenness error bound, since they average betweenness and closeness.
+    """
+    if len(score) <= k:
+        return False
+    top = np.argsort(-score)[:k]
+    return (score[top] - bound[top] / 2).min() >= np.max(np.delete(score + bound / 2, top))
+
+
+def sampled_betweenness(A, k=10, epsilon=0.05, delta=0.1, workers=1, seed=None, batch=SOURCE_BATCH,
+                        closeness=None, pool=None):
+    """Normalized betweenness from random pivots, with per-node error bounds.
+
+    Each pivot gives an unbiased estimate n * delta_s(v) / ((n-1)(n-2)) in [0, n/(n-1)].
+    Pivots are added in batches until the empirical-Bernstein bound (union over all
+    nodes, failure probability `delta`) is below `epsilon` for the current top-k,
+    or the top-k by (betweenness + closeness) / 2 is separated from the rest.
+    Sampling every node gives the exact value with zero error.
+    """
+    n = A.shape[0]
+    if n < 3:
+        return np.zeros(n), np.zeros(n), n
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(n)
+    scale = n / ((n - 1) * (n - 2))
+    value_range = n / (n - 1)
+    log_term = np.log(3 * n / delta)
+    closeness = np.zeros(n) if closeness is None else closeness
+
+    total, squares, used = np.zeros(n), np.zeros(n), 0
+    while used < n:
+        shards = np.array_split(order[used:used + batch * max(workers, 1)], max(workers, 1))
+        results = pool.map(_dependency_moments, [A] * len(shards), shards) if pool else \
+            [_dependency_moments(A, shard) for shard in shards]
+        for t, sq in results:
+            total += t
+            squares += sq
+        used = min(used + batch * max(workers, 1), n)
+        if used == n:
+            return total * scale / n, np.zeros(n), n
+
+        mean = total * scale / used
+        variance = np.maximum(squares * scale ** 2 / used - mean ** 2, 0)
+        bound = np.sqrt(2 * variance * log_term / used) + 3 * value_range * log_term / used
+        score = (mean + closeness) / 2
+        top = np.argsort(-score)[:k + 1]
+        if top_k_separated(score, bound, k) or bound[top[:k]].max() <= epsilon:
+            return mean, bound, used
+    return total * scale / n, np.zeros(n), n
+
+
+# === Top-k priority ranking ===
+def top_k_priority(A, names, k=10, epsilon=0.05, workers=1, seed=None):
+    """Top-k nodes by (betweenness + closeness) / 2 with bounds on each score."""
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        closeness = closeness_centrality(A, workers, pool)
+        betweenness, bound, pivots = sampled_betweenness(
+            A, k=k, epsilon=epsilon, workers=workers, seed=seed, closeness=closeness, pool=pool)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    score = (betweenness + closeness) / 2
+    top = np.argsort(-score, kind='stable')[:k]
+    return [{
+        'node': names[i],
+        'score': float(score[i]),
+        'score_low': float(max(betweenness[i] - bound[i], 0) + closeness[i]) / 2,
+        'score_high': float(betweenness[i] + bound[i] + closeness[i]) / 2,
+        'betweenness': float(betweenness[i]),
+        'closeness': float(closeness[i]),
+        'pivots': pivots,
+    } for i in top]
@@ -0,0 +1,233 @@
+import itertools
+import numpy as np
+import pandas as pd
+import networkx as nx
+from scipy import sparse
+
+THREAD_KEYS = ['page_name', 'thread_subject']
+CSV_CHUNK_ROWS = 100_000
+
+
+# === Streaming CSV ingestion: strings interned into int32 codes, one chunk at a time ===
+class Interner:
+    """Value -> int32 code dictionary; codes follow first appearance across chunks, -1 is missing."""
+
+    def __init__(self):
+        self.codes = {}
+
+    def __len__(self):
+        return len(self.codes)
+
+    def encode(self, values):
+        codes, uniques = pd.factorize(values)
+        if not len(uniques):
+            return np.full(len(codes), -1, dtype=np.int32)
+        uniques = uniques.tolist()
+        table = np.fromiter(map(self.codes.get, uniques, itertools.repeat(-1)), dtype=np.int32, count=len(uniques))
+        new = np.flatnonzero(table < 0)
+        table[new] = np.arange(len(self.codes), len(self.codes) + len(new), dtype=np.int32)
+        self.codes.update(zip(map(uniques.__getitem__, new.tolist()), table[new].tolist()))
+        return np.where(codes >= 0, table[codes], -1).astype(np.int32)
+
+    def values(self):
+        return np.array(list(self.codes), dtype=object)
+
+    def sorted_rank(self):
+        """(position of each code in sorted value order, values in sorted order)."""
+        values = self.values()
+        order = np.argsort(values, kind='stable')
+        rank = np.empty(len(values), dtype=np.int32)
+        rank[order] = np.arange(len(values), dtype=np.int32)
+        return rank, values[order]
+
+
+def _csv_chunks(file_path, columns, chunksize):
+    return pd.read_csv(file_path, usecols=columns, dtype=str, chunksize=chunksize)
+
+
+def intern_chunks(frames, columns):
+    """Yield {column: int32 codes} per DataFrame chunk; returns the column Interners when exhausted."""
+    tables = {column: Interner() for column in columns}
+    for chunk in frames:
+        yield {column: tables[column].encode(chunk[column]) for column in columns}
+    return tables
+
+
+def read_chunks(file_path, columns=None, chunksize=CSV_CHUNK_ROWS):
+    """`intern_chunks` over a CSV read `chunksize` rows at a time."""
+    columns = columns or THREAD_KEYS + ['username']
+    return intern_chunks(_csv_chunks(file_path, columns, chunksize), columns)
+
+
+def _drain(chunks, consume):
+    """Feed every chunk of a `read_chunks` generator to `consume`; return the generator's Interners."""
+    while True:
+        try:
+            consume(next(chunks))
+        except StopIteration as stop:
+            return stop.value
+
+
+def _distinct_memberships(thread, user, first):
+    """One entry per (thread, user), sorted by both, keeping the earliest row."""
+    if not len(thread):
+        return thread, user, first
+    page, subject = thread >> 32, thread & 0xFFFFFFFF
+    user_bits, subject_bits = int(user.max()).bit_length(), int(subject.max()).bit_length()
+    if int(page.max()).bit_length() + subject_bits + user_bits > 62:
+        order = np.lexsort((first, user, thread))
+        thread, user, first = thread[order], user[order], first[order]
+        keep = np.ones(len(thread), dtype=bool)
+        keep[1:] = (thread[1:] != thread[:-1]) | (user[1:] != user[:-1])
+        return thread[keep], user[keep], first[keep]
+    # Usual case: (page, subject, user) packs into one int64, a single-key sort instead of lexsort
+    key = (((page << subject_bits) | subject) << user_bits) | user
+    order = np.argsort(key)
+    key = key[order]
+    start = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+    return thread[order[start]], user[order[start]], np.minimum.reduceat(first[order], start)
+
+
+def stream_threads(file_path, chunksize=CSV_CHUNK_ROWS):
+    """`encode_threads` of a CSV without loading it: one entry per (thread, user) membership.
+
+    Each chunk is reduced to its distinct memberships and merged into the running set, so memory
+    is bounded by the incidence size and the interned names, not by the number of rows.
+    Memberships come out ordered by thread, then by the row that first added the user.
+    A file that fits in a single chunk is handed to `encode_threads` as is (one entry per row).
+    """
+    columns = THREAD_KEYS + ['username']
+    frames = _csv_chunks(file_path, columns, chunksize)
+    head = list(itertools.islice(frames, 2))
+    if len(head) == 1:
+        # Nothing to merge: skip interning and the membership passes
+        return encode_threads(head[0])
+
+    parts = []  # (thread, user, first) arrays; thread is (page code << 32) | subject code
+    offset = 0
+
+    def compact():
+        return _distinct_memberships(*(np.concatenate(column) for column in zip(*parts)))
+
+    def consume(chunk):
+        nonlocal parts, offset
+        page, subject, users = chunk['page_name'], chunk['thread_subject'], chunk['username']
+        valid = (page >= 0) & (subject >= 0) & (users >= 0)
+        parts.append(_distinct_memberships((page[valid].astype(np.int64) << 32) | subject[valid],
+                                           users[valid], offset + np.flatnonzero(valid)))
+        offset += len(page)
+        # Re-merge once the unmerged chunks outgrow the merged set: amortized O(n log n) overall
+        pending = sum(len(part[0]) for part in parts[1:])
+        if pending >= len(parts[0][0]):
+            parts = [compact()]
+
+    tables = _drain(intern_chunks(itertools.chain(head, frames), columns), consume)
+    empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int64))
+    thread, user, first = compact() if parts else empty
+
+    # Thread codes in groupby(sort=True) order: by page name, then subject
+    page_rank, _ = tables['page_name'].sorted_rank()
+    subject_rank, _ = tables['thread_subject'].sorted_rank()
+    sort_key = page_rank[thread >> 32].astype(np.int64) * len(subject_rank) + subject_rank[thread & 0xFFFFFFFF]
+    threads, thread_codes = np.unique(sort_key, return_inverse=True)
+
+    order = np.lexsort((first, thread_codes))
+    return thread_codes[order], user[order], len(threads), tables['username'].values()
+
+
+def load_data(file_path, chunksize=CSV_CHUNK_ROWS):
+    """Thread keys and usernames as categorical columns (int codes, sorted categories), read in chunks."""
+    parts = []
+    tables = _drain(read_chunks(file_path, chunksize=chunksize), parts.append)
+    columns = {}
+    for column in THREAD_KEYS + ['username']:
+        rank, values = tables[column].sorted_rank()
+        codes = np.concatenate([part[column] for part in parts]) if parts else np.empty(0, dtype=np.int32)
+        codes = np.where(codes >= 0, rank[codes] if len(rank) else -1, -1)
+        columns[column] = pd.Categorical.from_codes(codes, categories=pd.Index(values, dtype=object))
+    return pd.DataFrame(columns)
+
+
+# === Incidence: integer-coded user/thread membership ===
+def incidence_from_codes(thread_codes, user_codes, n_threads, n_users):
+    """Binary (threads x users) CSR matrix; repeated posts in a thread count once."""
+    data = np.ones(len(thread_codes), dtype=np.int32)
+    B = sparse.csr_matrix((data, (thread_codes, user_codes)), shape=(n_threads, n_users))
+    B.sum_duplicates()
+    B.data[:] = 1
+    return B
+
+
+def cooccurrence_from_incidence(B):
+    """Symmetric (users x users) weight matrix: number of threads shared by each pair."""
+    A = (B.T @ B).tocsr()
+    A.setdiag(0)
+    A.eliminate_zeros()
+    return A
+
+
+def _sorted_codes(column):
+    """Codes in sorted value order, -1 for missing; categorical columns with sorted categories reuse theirs."""
+    if isinstance(column.dtype, pd.CategoricalDtype) and column.cat.categories.is_monotonic_increasing:
+        return column.cat.codes.to_numpy(), column.cat.categories
+    return pd.factorize(column, sort=True)
+
+
+def encode_threads(df):
+    """Integer codes for threads (sorted like groupby) and users (first appearance).
+
+    Rows with a missing page, subject or username get code -1 and are ignored.
+    """
+    page, _ = _sorted_codes(df['page_name'])
+    subject, subjects = _sorted_codes(df['thread_subject'])
+    has_thread = (page >= 0) & (subject >= 0)
+    thread_codes = np.full(len(df), -1, dtype=np.int64)
+    _, thread_codes[has_thread] = np.unique(page[has_thread].astype(np.int64) * len(subjects) + subject[has_thread],
+                                            return_inverse=True)
+    user_codes, usernames = pd.factorize(df['username'])
+    valid = (thread_codes >= 0) & (user_codes >= 0)
+    return thread_codes[valid], user_codes[valid], int(thread_codes.max(initial=-1)) + 1, np.asarray(usernames)
+
+
+# === Co-occurrence network ===
+def build_cooccurrence(df):
+    """Weighted editor co-occurrence network as a CSR matrix plus its username table.
+
+    Nodes are the users that share at least one thread with someone else, in the
+    order a per-thread `combinations` loop over sorted groups would first add them.
+    """
+    return cooccurrence_from_codes(*encode_threads(df))
+
+
+def cooccurrence_from_codes(thread_codes, user_codes, n_threads, usernames):
+    """`build_cooccurrence` from `encode_threads` / `stream_threads` output."""
+    B = incidence_from_codes(thread_codes, user_codes, n_threads, len(usernames))
+    A = cooccurrence_from_incidence(B)
+
+    # Node order: first appearance over threads with at least two distinct users
+    thread_sizes = np.diff(B.indptr)
+    in_pair = thread_sizes[thread_codes] >= 2
+    order = np.argsort(thread_codes[in_pair], kind='stable')
+    nodes = pd.unique(user_codes[in_pair][order])
+
+    A = A[nodes][:, nodes].tocsr()
+    return A, np.asarray(usernames)[nodes]
+
+
+def to_networkx(A, usernames):
+    G = nx.Graph()
+    G.add_nodes_from(usernames)
+    upper = sparse.triu(A, k=1).tocoo()
+    G.add_weighted_edges_from(zip(usernames[upper.row], usernames[upper.col], upper.data.tolist()))
+    return G
+
+
+def build_editor_network(df):
+    return to_networkx(*build_cooccurrence(df))
+
+
+def graph_to_csr(G, weight='weight'):
+    """CSR handle for an existing graph, with nodes in `G.nodes` order."""
+    nodes = list(G.nodes())
+    A = sparse.csr_matrix(nx.to_scipy_sparse_array(G, nodelist=nodes, weight=weight, format='csr'))
+    return A, np.array(nodes, dtype=object)
@@ -0,0 +1,101 @@
+import os
+import json
+import shutil
+import hashlib
+import time
+import numpy as np
+from scipy import sparse
+from editor_network import stream_threads, cooccurrence_from_codes, to_networkx
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+MAX_CACHE_BYTES = 256 * 1024 ** 2
+TMP_MAX_AGE = 3600  # seconds before an unpublished *.tmp build counts as abandoned
+BUILDER_PARAMS = {"builder": "cooccurrence", "version": 1}
+
+ARRAYS = ("indptr", "indices", "weights")
+
+
+# === Cache keys: source CSV content + builder parameters ===
+def dataset_key(file_path, params=None):
+    h = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    h.update(json.dumps(params or BUILDER_PARAMS, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+# === Save / load one network as CSR arrays plus a username table ===
+def save_network(key, A, usernames, cache_dir=CACHE_DIR):
+    entry = os.path.join(cache_dir, key)
+    tmp = f"{entry}.{os.getpid()}.tmp"  # per process, so parallel builds do not collide
+    os.makedirs(tmp, exist_ok=True)
+    np.save(os.path.join(tmp, "indptr.npy"), A.indptr)
+    np.save(os.path.join(tmp, "indices.npy"), A.indices)
+    np.save(os.path.join(tmp, "weights.npy"), A.data)
+    with open(os.path.join(tmp, "usernames.json"), "w", encoding="utf-8") as f:
+        json.dump([str(u) for u in usernames], f, ensure_ascii=False)
+    # Entries are immutable per key: if another process published first, keep its copy
+    try:
+        if os.path.isdir(entry):
+            raise FileExistsError(entry)
+        os.replace(tmp, entry)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def load_network(key, cache_dir=CACHE_DIR):
+    """Memory-mapped (A, usernames) for a cached key, or None on a miss."""
+    entry = os.path.join(cache_dir, key)
+    try:
+        indptr, indices, weights = (np.load(os.path.join(entry, f"{name}.npy"), mmap_mode="r") for name in ARRAYS)
+        with open(os.path.join(entry, "usernames.json"), encoding="utf-8") as f:
+            usernames = np.array(json.load(f), dtype=object)
+        os.utime(entry)  # mark as recently used for eviction
+    except FileNotFoundError:  # never built, or evicted by another process while we read it
+        return None
+    n = len(usernames)
+    return sparse.csr_matrix((weights, indices, indptr), shape=(n, n), copy=False), usernames
+
+
+# === Size-bounded eviction (least recently used first) ===
+def evict(cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+    if not os.path.isdir(cache_dir):
+        return
+    entries = []
+    for name in os.listdir(cache_dir):
+        entry = os.path.join(cache_dir, name)
+        if not os.path.isdir(entry):
+            continue
+        try:
+            if name.endswith(".tmp"):
+                # Left behind by a build that died before publishing; recent ones may still be in progress
+                if time.time() - os.path.getmtime(entry) > TMP_MAX_AGE:
+                    shutil.rmtree(entry, ignore_errors=True)
+            else:
+                size = sum(os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry))
+                entries.append((os.path.getmtime(entry), size, entry))
+        except FileNotFoundError:  # published or evicted by another process meanwhile
+            continue
+    total = sum(size for _, size, _ in entries)
+    for _, size, entry in sorted(entries):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= size
+
+
+def load_editor_network(file_path, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+    """(A, usernames) for a discussion CSV, built once and then served from the cache."""
+    key = dataset_key(file_path)
+    cached = load_network(key, cache_dir)
+    if cached is not None:
+        return cached
+    A, usernames = cooccurrence_from_codes(*stream_threads(file_path))  # CSV streamed in chunks
+    save_network(key, A, usernames, cache_dir)
+    evict(cache_dir, max_bytes)
+    return A, usernames
+
+
+def load_editor_graph(file_path, **kwargs):
+    return to_networkx(*load_editor_network(file_path, **kwargs))
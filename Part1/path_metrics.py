@@ -0,0 +1,104 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from scipy.sparse import csgraph
+from scipy.stats import norm
+
+BFS_CHUNK = 64
+
+
+# === Breadth-first search over CSR adjacency ===
+def bfs_distances(A, sources, chunk=BFS_CHUNK):
+    """Hop distances (len(sources) x n) from each source; unreachable nodes are inf."""
+    sources = np.atleast_1d(sources)
+    out = np.empty((len(sources), A.shape[0]))
+    for start in range(0, len(sources), chunk):
+        out[start:start + chunk] = csgraph.shortest_path(
+            A, method='D', directed=False, unweighted=True, indices=sources[start:start + chunk])
+    return out
+
+
+def largest_component(A):
+    """Adjacency of the largest connected component and its node indices in A."""
+    n_components, labels = csgraph.connected_components(A, directed=False)
+    nodes = np.flatnonzero(labels == np.bincount(labels).argmax())
+    return A[nodes][:, nodes].tocsr(), nodes, n_components
+
+
+# === Exact diameter with iFUB bound pruning ===
+def exact_diameter(A, chunk=BFS_CHUNK):
+    """Diameter of a connected graph without all-pairs search (double sweep + iFUB).
+
+    A double sweep from the highest-degree node gives the lower bound and a long path;
+    iFUB then starts from a hub halfway along that path and computes eccentricities only
+    for its BFS fringe levels until the lower bound meets the upper bound 2 * (level - 1).
+    """
+    if A.shape[0] < 2:
+        return 0
+    degree = np.diff(A.indptr)
+
+    # Double sweep from the highest-degree node gives a lower bound and a long path a-b
+    d_r = bfs_distances(A, [int(degree.argmax())])[0]
+    a = int(d_r.argmax())
+    d_a = bfs_distances(A, [a])[0]
+    lower = int(d_a.max())
+    d_b = bfs_distances(A, [int(d_a.argmax())])[0]
+
+    # Start iFUB from the highest-degree node halfway along a-b
+    middle = np.flatnonzero((d_a == lower // 2) & (d_b == lower - lower // 2))
+    u = int(middle[degree[middle].argmax()])
+    d_u = bfs_distances(A, [u])[0]
+    level = int(d_u.max())
+    lower = max(lower, level)
+    upper = 2 * level
+
+    while upper > lower:
+        fringe = np.flatnonzero(d_u == level)
+        for start in range(0, len(fringe), chunk):
+            lower = max(lower, int(bfs_distances(A, fringe[start:start + chunk], chunk).max()))
+        if lower > 2 * (level - 1):
+            break
+        upper = 2 * (level - 1)
+        level -= 1
+    return lower
+
+
+# === Average path length from random BFS sources ===
+def _source_means(A, sources, chunk=BFS_CHUNK):
+    """Mean hop distance from each source to the nodes it reaches."""
+    total, found = np.empty(len(sources)), np.empty(len(sources))
+    for start in range(0, len(sources), chunk):
+        # Reduce each block of BFS rows right away; all sources at once would be len(sources) x n
+        dist = bfs_distances(A, sources[start:start + chunk], chunk)
+        reachable = np.isfinite(dist)
+        total[start:start + chunk] = np.where(reachable, dist, 0).sum(axis=1)
+        found[start:start + chunk] = reachable.sum(axis=1) - 1
+    return total / found
+
+
+def sampled_path_length(A, n_sources=300, seed=None, workers=1, confidence=0.95):
+    """Estimate the mean shortest-path length of a connected graph.
+
+    Sources are drawn uniformly without replacement, so the mean of the per-source
+    averages is unbiased; the interval uses a finite-population-corrected normal
+    approximation and collapses to the exact value when every node is a source.
+    """
+    n = A.shape[0]
+    if n < 2:
+        return {'mean': 0.0, 'ci_low': 0.0, 'ci_high': 0.0, 'sources': n}
+    rng = np.random.default_rng(seed)
+    k = min(n_sources, n)
+    sources = rng.choice(n, size=k, replace=False)
+
+    if workers > 1 and k > 1:
+        shards = np.array_split(sources, min(workers, k))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            means = np.concatenate(list(pool.map(_source_means, [A] * len(shards), shards)))
+    else:
+        means = _source_means(A, sources)
+
+    mean = float(means.mean())
+    spread = 0.0
+    if k > 1:
+        fpc = np.sqrt((n - k) / (n - 1))
+        spread = float(norm.ppf(0.5 + confidence / 2) * means.std(ddof=1) / np.sqrt(k) * fpc)
+    return {'mean': mean, 'ci_low': mean - spread, 'ci_high': mean + spread, 'sources': k}
@@ -0,0 +1,63 @@
+import numpy as np
+from collections import OrderedDict
+from scipy.sparse import csgraph
+from path_metrics import bfs_distances, BFS_CHUNK
+
+MAX_CACHE_BYTES = 64 * 1024 ** 2
+
+
+# === Batch spread-probability queries with an LRU cache of BFS distance arrays ===
+class SpreadIndex:
+    """Answers 1 / (d + 1) for many (source, target) pairs with one BFS per source.
+
+    Distance rows are kept in an LRU cache bounded by `max_cache_bytes`; pairs in
+    different connected components are answered as 0 without any search.
+    """
+
+    def __init__(self, A, names, max_cache_bytes=MAX_CACHE_BYTES):
+        self.A = A
+        self.index = {name: i for i, name in enumerate(names)}
+        self.max_cache_bytes = max_cache_bytes
+        self._labels = csgraph.connected_components(A, directed=False)[1]
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
+
+    def _remember(self, source, row):
+        self._cache[source] = row
+        self._cache_bytes += row.nbytes
+        while self._cache_bytes > self.max_cache_bytes and self._cache:
+            _, old = self._cache.popitem(last=False)
+            self._cache_bytes -= old.nbytes
+
+    def _rows(self, sources):
+        """Yield (source, distance row) for each source, cached rows first."""
+        missing = []
+        for s in sources:
+            if s in self._cache:
+                self._cache.move_to_end(s)
+                yield s, self._cache[s]
+            else:
+                missing.append(s)
+        for start in range(0, len(missing), BFS_CHUNK):
+            chunk = missing[start:start + BFS_CHUNK]
+            for s, row in zip(chunk, bfs_distances(self.A, chunk).astype(np.float32)):
+                self._remember(s, row)
+                yield s, row
+
+    def probabilities(self, pairs):
+        """Vectorized 1 / (d + 1) scores for a list of (source, target) node pairs."""
+        pairs = list(pairs)
+        src = np.fromiter((self.index[u] for u, _ in pairs), dtype=np.int64, count=len(pairs))
+        dst = np.fromiter((self.index[v] for _, v in pairs), dtype=np.int64, count=len(pairs))
+        scores = np.zeros(len(pairs))
+
+        reachable = self._labels[src] == self._labels[dst]
+        positions = np.flatnonzero(reachable)
+        order = positions[np.argsort(src[positions], kind='stable')]
+        sources, starts = np.unique(src[order], return_index=True)
+        groups = dict(zip(sources.tolist(), np.split(order, starts[1:])))
+
+        for s, row in self._rows(sources.tolist()):
+            group = groups[s]
+            scores[group] = 1 / (row[dst[group]].astype(np.float64) + 1)
+        return scores
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from editor_network import THREAD_KEYS, encode_threads, incidence_from_codes, cooccurrence_from_incidence
+
+ARCHIVE_PATTERN = r'Archive(\d{4})(\d{2})'
+
+
+def archive_month(page_names):
+    """'YYYY-MM' archive period parsed from page names (e.g. ...Archive201210.json), NaN if undated."""
+    parts = pd.Series(page_names).str.extract(ARCHIVE_PATTERN)
+    return parts[0] + '-' + parts[1]
+
+
+# === Incrementally maintained co-occurrence network ===
+class TemporalEditorNetwork:
+    """Cumulative editor network that grows one archive month at a time.
+
+    Every month only adds its own threads, so ingesting it costs time proportional
+    to its co-occurrence pairs (and the degrees of the touched users), not to the
+    history. Edge weights, triangle counts and the sum of local clustering
+    coefficients are updated in place for the nodes a month touches.
+    """
+
+    def __init__(self):
+        self.index = {}
+        self.usernames = []
+        self.adj = []            # neighbour -> weight, per node
+        self.triangles = []      # triangles through each node
+        self.local_clustering = []
+        self.n_edges = 0
+        self.n_triangles = 0
+        self.n_triads = 0        # connected triples (paths of length two)
+        self.clustering_sum = 0.0
+
+    def _node(self, name):
+        i = self.index.get(name)
+        if i is None:
+            i = self.index[name] = len(self.usernames)
+            self.usernames.append(name)
+            self.adj.append({})
+            self.triangles.append(0)
+            self.local_clustering.append(0.0)
+        return i
+
+    def add_month(self, df):
+        """Add one month's rows (page_name, thread_subject, username) and return the snapshot stats."""
+        df = df.dropna(subset=THREAD_KEYS + ['username'])
+        if len(df):
+            thread_codes, user_codes, n_threads, names = encode_threads(df)
+        else:
+            thread_codes, user_codes, n_threads, names = [], [], 0, []
+        B = incidence_from_codes(thread_codes, user_codes, n_threads, len(names))
+        delta = sparse.triu(cooccurrence_from_incidence(B), k=1).tocoo()
+
+        touched = set()
+        for a, b, w in zip(delta.row.tolist(), delta.col.tolist(), delta.data.tolist()):
+            u, v = self._node(names[a]), self._node(names[b])
+            if v in self.adj[u]:
+                self.adj[u][v] += w
+                self.adj[v][u] += w
+                continue
+            # New edge: closes one triangle per common neighbour
+            nu, nv = self.adj[u], self.adj[v]
+            small, large = (nu, nv) if len(nu) <= len(nv) else (nv, nu)
+            common = [x for x in small if x in large]
+            for x in common:
+                self.triangles[x] += 1
+                touched.add(x)
+            self.triangles[u] += len(common)
+            self.triangles[v] += len(common)
+            self.n_triangles += len(common)
+            self.n_triads += len(nu) + len(nv)
+            nu[v] = w
+            nv[u] = w
+            self.n_edges += 1
+            touched.update((u, v))
+
+        for x in touched:
+            d = len(self.adj[x])
+            c = 2.0 * self.triangles[x] / (d * (d - 1)) if d > 1 else 0.0
+            self.clustering_sum += c - self.local_clustering[x]
+            self.local_clustering[x] = c
+        return self.stats()
+
+    def stats(self):
+        n, m, triads = len(self.usernames), self.n_edges, self.n_triads
+        return {
+            'nodes': n,
+            'edges': m,
+            'density': 2.0 * m / (n * (n - 1)) if n > 1 else 0.0,
+            'avg_clustering': self.clustering_sum / n if n else 0.0,
+            'transitivity': 3.0 * self.n_triangles / triads if triads else 0.0,
+            'triangles': self.n_triangles,
+        }
+
+    def snapshot(self):
+        """(A, usernames) of the current cumulative graph, as build_cooccurrence returns them."""
+        rows = np.repeat(np.arange(len(self.adj)), [len(a) for a in self.adj])
+        cols = np.fromiter((v for a in self.adj for v in a), dtype=np.int64, count=len(rows))
+        data = np.fromiter((w for a in self.adj for w in a.values()), dtype=np.int64, count=len(rows))
+        n = len(self.usernames)
+        return sparse.csr_matrix((data, (rows, cols)), shape=(n, n)), np.asarray(self.usernames, dtype=object)
+
+
+def monthly_snapshots(df, network=None):
+    """Per-month statistics of the cumulative network; undated pages are left out.
+
+    Pass an existing `network` to continue from earlier months (e.g. a new archive month).
+    """
+    network = network or TemporalEditorNetwork()
+    months = archive_month(df['page_name'])  # categorical pages are parsed once per category
+    rows = []
+    for month, part in df[months.notna().to_numpy()].groupby(months.dropna().to_numpy(), sort=True):
+        stats = network.add_month(part)
+        stats['month'] = month
+        stats['new_rows'] = len(part)
+        rows.append(stats)
+    columns = ['month', 'new_rows', 'nodes', 'edges', 'density', 'avg_clustering', 'transitivity', 'triangles']
+    return pd.DataFrame(rows, columns=columns), network
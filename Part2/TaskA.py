@@ -1,60 +1,108 @@
-import pandas as pd
 import geopandas as gpd
-from shapely.geometry import Point, box
+from shapely.geometry import Point
 import osmnx as ox
 import networkx as nx
 import os
-import matplotlib.pyplot as plt
+from accidents import accident_points
+from hotspots import detect_hotspots, hotspot_center
+from osm_graph_store import osm_graph
+from tile_stats import grid_tiles, tile_statistics
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.tracing import stage, describe
+from common.rendering import SHOW
 
 # === Step 1: Load traffic accident data ===
-df = pd.read_csv("../Datasets/Traffic_accidents_2019_Leeds.csv")
-
-# Construct GeoDataFrame using British National Grid (EPSG:27700)
-gdf = gpd.GeoDataFrame(
-    df,
-    geometry=[Point(xy) for xy in zip(df["Grid Ref: Easting"], df["Grid Ref: Northing"])],
-    crs="EPSG:27700"
-)
+# GeoDataFrame in British National Grid (EPSG:27700), served from the columnar accident store
 
 # === Step 2: Identify the most accident-dense hotspot center ===
-gdf['x'] = gdf.geometry.x
-gdf['y'] = gdf.geometry.y
-bins_x = pd.cut(gdf['x'], bins=100)
-bins_y = pd.cut(gdf['y'], bins=100)
-heatmap = gdf.groupby([bins_x, bins_y], observed=False).size().reset_index(name='count')
-hot_cell = heatmap.sort_values('count', ascending=False).iloc[0]
-
-# Extract the center coordinates of the hotspot cell
-target_x = hot_cell['x'].mid
-target_y = hot_cell['y'].mid
-center_point = Point(target_x, target_y)
-
-# Reproject to WGS84 (latitude & longitude)
-gdf_center = gpd.GeoSeries([center_point], crs="EPSG:27700").to_crs(epsg=4326)
-center_latlon = gdf_center.values[0]
-
-north, south, east, west = ox.utils_geo.bbox_from_point((center_latlon.y, center_latlon.x), dist=500)
-bbox = (north, south, east, west)
-G = ox.graph_from_bbox(bbox, network_type="drive")
-
-stats = ox.basic_stats(G)
-G_proj = ox.project_graph(G)
-edges = ox.graph_to_gdfs(G_proj, nodes=False)
-area_km2 = edges.geometry.union_all().convex_hull.area / 1e6
-
-node_density = stats['n'] / area_km2
-edge_density = stats['m'] / area_km2
-intersection_density = stats['intersection_count'] / area_km2
-
-print("\n Hotspot center coordinate (WGS84):", center_latlon)
-print(" Number of network nodes:", stats['n'])
-print(" Average street segment length: {:.2f} m".format(stats['street_length_avg']))
-print(" Network area: {:.2f} km²".format(area_km2))
-print(" Node density: {:.2f} /km²".format(node_density))
-print(" Edge density: {:.2f} /km²".format(edge_density))
-print(" Intersection density: {:.2f} /km²".format(intersection_density))
-
-is_planar, _ = nx.check_planarity(G)
-print(" Is planar:", is_planar)
-
-ox.plot_graph(G, bgcolor='white', node_color='red', edge_color='gray',save=True,filepath='../results/2A_taskd_osmnx_network.png',dpi=300,show=True )
+def study_bbox(center, dist=500):
+    """Study box centre (WGS84) and its OSMnx bbox around a British National Grid centre."""
+    target_x, target_y = center
+    center_point = Point(target_x, target_y)
+
+    # Reproject to WGS84 (latitude & longitude)
+    gdf_center = gpd.GeoSeries([center_point], crs="EPSG:27700").to_crs(epsg=4326)
+    center_latlon = gdf_center.values[0]
+
+    north, south, east, west = ox.utils_geo.bbox_from_point((center_latlon.y, center_latlon.x), dist=dist)
+    return center_latlon, (north, south, east, west)
+
+
+def hotspot_bbox(gdf, dist=500):
+    """Top-k hotspot table, the study box centre (WGS84) and its OSMnx bbox."""
+    # Top-k non-overlapping hotspot cells at 1000 m, 500 m and 250 m resolution
+    hotspots = detect_hotspots(gdf.geometry.x, gdf.geometry.y, k=5)
+
+    # The 1 km study box analysed below: the densest 1000 m cell
+    center_latlon, bbox = study_bbox(hotspot_center(gdf), dist=dist)
+    return hotspots, center_latlon, bbox
+
+
+# === Step 3: Street-network indicators of the hotspot box ===
+def network_stats(G, G_proj):
+    stats = ox.basic_stats(G)
+    edges = ox.graph_to_gdfs(G_proj, nodes=False)
+    area_km2 = edges.geometry.union_all().convex_hull.area / 1e6
+    is_planar, _ = nx.check_planarity(G)
+    return {
+        "n": stats['n'],
+        "street_length_avg": stats['street_length_avg'],
+        "area_km2": area_km2,
+        "node_density": stats['n'] / area_km2,
+        "edge_density": stats['m'] / area_km2,
+        "intersection_density": stats['intersection_count'] / area_km2,
+        "is_planar": is_planar,
+    }
+
+
+# === Step 4: City-wide tiled statistics (optional) ===
+def city_tile_stats(hotspots, tile_mode="grid", workers=1):
+    """The Step 3 indicators for every 1 km tile of Leeds ("grid") or around every hotspot ("hotspots").
+
+    One projected Leeds graph, tiles cut from it in memory instead of one download per tile.
+    """
+    G_city = osm_graph(place="Leeds, UK", network_type="drive", project="EPSG:27700")
+    if tile_mode == "grid":
+        node_x = [d["x"] for _, d in G_city.nodes(data=True)]
+        node_y = [d["y"] for _, d in G_city.nodes(data=True)]
+        centres = grid_tiles(node_x, node_y, tile_size=1000)
+    else:
+        centres = hotspots.loc[hotspots["cell_size"] == 1000, ["x", "y"]].to_numpy()
+    return tile_statistics(G_city, centres, tile_size=1000, workers=workers)
+
+
+# === Main execution ===
+def main(tile_mode=None, workers=1):
+    gdf = accident_points()
+    hotspots, center_latlon, bbox = hotspot_bbox(gdf)
+    print(hotspots.to_string(index=False))
+
+    # Simplified graphs come from the local graph store after the first download
+    with stage("osmnx_fetch") as s:
+        G = osm_graph(bbox=bbox, network_type="drive")
+        s.record(**describe(G))
+    with stage("projection") as s:
+        G_proj = osm_graph(bbox=bbox, network_type="drive", project=True)
+        s.record(**describe(G_proj))
+    stats = network_stats(G, G_proj)
+
+    print("\n Hotspot center coordinate (WGS84):", center_latlon)
+    print(" Number of network nodes:", stats['n'])
+    print(" Average street segment length: {:.2f} m".format(stats['street_length_avg']))
+    print(" Network area: {:.2f} km²".format(stats['area_km2']))
+    print(" Node density: {:.2f} /km²".format(stats['node_density']))
+    print(" Edge density: {:.2f} /km²".format(stats['edge_density']))
+    print(" Intersection density: {:.2f} /km²".format(stats['intersection_density']))
+    print(" Is planar:", stats['is_planar'])
+
+    # None: the single hotspot box above; "grid" or "hotspots": every tile of the city
+    if tile_mode:
+        tiles = city_tile_stats(hotspots, tile_mode, workers)
+        tiles.to_csv(f"../Results/2A_tile_stats_{tile_mode}.csv", index=False)
+        print(f"\n Tiled statistics for {len(tiles)} tiles saved to 2A_tile_stats_{tile_mode}.csv")
+
+    ox.plot_graph(G, bgcolor='white', node_color='red', edge_color='gray',save=True,filepath='../results/2A_taskd_osmnx_network.png',dpi=300,show=SHOW,close=not SHOW )
+
+if __name__ == "__main__":
+    main()
@@ -1,65 +1,117 @@
 import os
-import pandas as pd
 import geopandas as gpd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from shapely.geometry import Point
-from libpysal.weights import DistanceBand
-from esda.moran import Moran
-
-df = pd.read_csv("../Datasets/Traffic_accidents_2019_Leeds.csv")
-gdf = gpd.GeoDataFrame(df, geometry=gpd.points_from_xy(df["Grid Ref: Easting"], df["Grid Ref: Northing"]), crs="EPSG:27700")
-
-# Define hotspot center and 1km x 1km buffer area
-center_point = Point(430000, 433500)
-buffer_polygon = center_point.buffer(500)
-bbox = gpd.GeoDataFrame({'geometry': [buffer_polygon]}, crs="EPSG:27700")
-gdf_clip = gpd.clip(gdf, bbox)
-
-gdf_nodes = gpd.read_file("network_nodes.geojson")
-gdf_nodes = gdf_nodes.to_crs(gdf_clip.crs)
-
-# Calculate distance to nearest intersection
-gdf_clip.loc[:, "nearest_dist"] = gdf_clip.geometry.apply(lambda x: gdf_nodes.distance(x).min())
-
-gdf_clip_proj = gdf_clip.to_crs(epsg=3857)
-coords = list(zip(gdf_clip_proj.geometry.x, gdf_clip_proj.geometry.y))
-w = DistanceBand(coords, threshold=200, binary=True)
-moran = Moran(gdf_clip_proj["Grid Ref: Easting"], w)
-
-# Summary statistics
-num_accidents = len(gdf_clip)
-avg_dist = gdf_clip["nearest_dist"].mean()
-max_dist = gdf_clip["nearest_dist"].max()
-min_dist = gdf_clip["nearest_dist"].min()
-
-print("Number of accident points:", num_accidents)
-print("Moran's I:", moran.I)
-print("p-value:", moran.p_norm)
-print("Average distance to nearest intersection:", avg_dist)
-print("Maximum distance:", max_dist)
-print("Minimum distance:", min_dist)
-
-# Save results to a .txt file
-with open("../Results/Part2_taskb_results.txt", "w") as f:
-    f.write(f"Number of accident points: {num_accidents}\n")
-    f.write(f"Moran's I: {moran.I:.4f}\n")
-    f.write(f"p-value: {moran.p_norm:.4e}\n")
-    f.write(f"Average distance to nearest intersection: {avg_dist:.2f} m\n")
-    f.write(f"Maximum distance: {max_dist:.2f} m\n")
-    f.write(f"Minimum distance: {min_dist:.2f} m\n")
-
-plt.figure(figsize=(8, 4))
-sns.histplot(gdf_clip["nearest_dist"], bins=20, kde=True, color="steelblue", edgecolor="black")
-plt.xlabel("Distance to Nearest Intersection (meters)")
-plt.ylabel("Number of Accidents")
-plt.title("Distribution of Accident-to-Intersection Distances")
-plt.grid(True)
-plt.tight_layout()
-
-# Save the figure
-output_path = "../Results/2B_Figure_Distance_Distribution.png"
-plt.savefig(output_path)
-print(f"The figure has been saved to: {output_path}")
-
-plt.show()
+import numpy as np
+from snapping import NodeSnapper
+from accidents import accident_points
+from hotspots import nodes_center, check_node_coverage
+from spatial_autocorrelation import distance_band_weights, global_moran, local_moran
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.tracing import traced
+from common.rendering import show
+
+
+# === Step 1: Accidents inside the 1 km x 1 km hotspot box ===
+def clip_to_hotspot(gdf, center, radius=500):
+    # Define hotspot center and 1km x 1km buffer area
+    center_point = Point(center)
+    buffer_polygon = center_point.buffer(radius)
+    bbox = gpd.GeoDataFrame({'geometry': [buffer_polygon]}, crs="EPSG:27700")
+    return gpd.clip(gdf, bbox)
+
+
+# === Step 2: Distance to nearest intersection ===
+def nearest_intersection_distances(points, gdf_nodes):
+    gdf_nodes = gdf_nodes.to_crs(points.crs)
+    _, nearest_dist = NodeSnapper(gdf_nodes).nearest(points.geometry)
+    return nearest_dist
+
+
+# === Step 3: Spatial autocorrelation ===
+# 200 m distance-band weights built directly in EPSG:27700 metres
+@traced()
+def moran_stage(points, permutations=999, workers=1):
+    coords = np.column_stack([points.geometry.x, points.geometry.y])
+    w = distance_band_weights(coords, threshold=200)
+    y = points["Grid Ref: Easting"].to_numpy(dtype=float)
+    return (global_moran(y, w, permutations=permutations, workers=workers, seed=42),
+            local_moran(y, w, permutations=permutations, workers=workers, seed=42))
+
+
+def lisa_cluster_counts(lisa, alpha=0.05):
+    significant = lisa["p_sim"] < alpha
+    return {label: int(((lisa["quadrant"] == q) & significant).sum())
+            for q, label in zip((1, 2, 3, 4), ("HH", "LH", "LL", "HL"))}
+
+
+# === Step 4: Save results and the distance distribution figure ===
+def write_results(path, num_accidents, moran, moran_city, lisa_counts, avg_dist, max_dist, min_dist):
+    with open(path, "w") as f:
+        f.write(f"Number of accident points: {num_accidents}\n")
+        f.write(f"Moran's I: {moran['I']:.4f}\n")
+        f.write(f"p-value: {moran['p_norm']:.4e}\n")
+        f.write(f"Permutation p-value: {moran['p_sim']:.4f}\n")
+        f.write(f"City-wide Moran's I: {moran_city['I']:.4f} (permutation p-value: {moran_city['p_sim']:.4f})\n")
+        f.write(f"City-wide significant LISA clusters (p < 0.05): {lisa_counts}\n")
+        f.write(f"Average distance to nearest intersection: {avg_dist:.2f} m\n")
+        f.write(f"Maximum distance: {max_dist:.2f} m\n")
+        f.write(f"Minimum distance: {min_dist:.2f} m\n")
+
+
+def plot_distance_distribution(distances, output_path):
+    plt.figure(figsize=(8, 4))
+    sns.histplot(distances, bins=20, kde=True, color="steelblue", edgecolor="black")
+    plt.xlabel("Distance to Nearest Intersection (meters)")
+    plt.ylabel("Number of Accidents")
+    plt.title("Distribution of Accident-to-Intersection Distances")
+    plt.grid(True)
+    plt.tight_layout()
+
+    # Save the figure
+    plt.savefig(output_path)
+    print(f"The figure has been saved to: {output_path}")
+
+
+# === Main execution ===
+def main():
+    gdf = accident_points()
+    center = nodes_center("network_nodes.geojson")
+    gdf_clip = clip_to_hotspot(gdf, center)
+
+    gdf_nodes = gpd.read_file("network_nodes.geojson")
+    check_node_coverage(gdf_nodes, center)
+    gdf_clip.loc[:, "nearest_dist"] = nearest_intersection_distances(gdf_clip, gdf_nodes)
+
+    moran, _ = moran_stage(gdf_clip)
+
+    # The same test over the full accident set, with local Moran (LISA) clusters
+    moran_city, lisa_city = moran_stage(gdf)
+    lisa_counts = lisa_cluster_counts(lisa_city)
+
+    # Summary statistics
+    num_accidents = len(gdf_clip)
+    avg_dist = gdf_clip["nearest_dist"].mean()
+    max_dist = gdf_clip["nearest_dist"].max()
+    min_dist = gdf_clip["nearest_dist"].min()
+
+    print("Number of accident points:", num_accidents)
+    print("Moran's I:", moran["I"])
+    print("p-value:", moran["p_norm"])
+    print("Permutation p-value:", moran["p_sim"])
+    print("City-wide Moran's I:", moran_city["I"], "p-value:", moran_city["p_sim"])
+    print("City-wide significant LISA clusters:", lisa_counts)
+    print("Average distance to nearest intersection:", avg_dist)
+    print("Maximum distance:", max_dist)
+    print("Minimum distance:", min_dist)
+
+    # Save results to a .txt file
+    write_results("../Results/Part2_taskb_results.txt", num_accidents, moran, moran_city, lisa_counts,
+                  avg_dist, max_dist, min_dist)
+    plot_distance_distribution(gdf_clip["nearest_dist"], "../Results/2B_Figure_Distance_Distribution.png")
+    show()
+
+if __name__ == "__main__":
+    main()
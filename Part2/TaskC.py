@@ -1,103 +1,111 @@
-import networkx as nx
 import geopandas as gpd
-import pandas as pd
 import matplotlib.pyplot as plt
-import random
 import os
 from shapely.geometry import Point
-import matplotlib.cm as cm
 import numpy as np
-
-# Load network nodes
-nodes_gdf = gpd.read_file("network_nodes.geojson")
-nodes_gdf = nodes_gdf.to_crs(epsg=27700)
-
-# Create graph from nodes
-G = nx.Graph()
-for idx, row in nodes_gdf.iterrows():
-    G.add_node(idx, osmid=row["osmid"], x=row.geometry.x, y=row.geometry.y, geometry=row.geometry)
-
-# Add edges between nodes that are within 100m
-for i, node1 in nodes_gdf.iterrows():
-    for j, node2 in nodes_gdf.iterrows():
-        if i != j:
-            dist = node1.geometry.distance(node2.geometry)
-            if dist < 100:
-                G.add_edge(i, j, weight=dist)
-
-# Load traffic accident data
-accidents_df = pd.read_csv("../Datasets/Traffic_accidents_2019_Leeds.csv")
-accident_gdf = gpd.GeoDataFrame(accidents_df,
-    geometry=gpd.points_from_xy(accidents_df["Grid Ref: Easting"], accidents_df["Grid Ref: Northing"]),
-    crs="EPSG:27700"
-)
-
-# Filter accidents within the hotspot area (buffer of 500m around a central point)
-hotspot_center = Point(430000, 433500)
-hotspot_area = hotspot_center.buffer(500)
-accident_hotspot = accident_gdf[accident_gdf.geometry.within(hotspot_area)]
-
-# Select seed nodes: find nearest graph node to each accident
-def find_nearest_node(point, nodes_gdf):
-    distances = nodes_gdf.geometry.distance(point)
-    return distances.idxmin()
-
-seed_nodes = set()
-for pt in accident_hotspot.geometry:
-    idx = find_nearest_node(pt, nodes_gdf)
-    seed_nodes.add(idx)
-
-# Independent Cascade model
-def run_ic_model(G, seeds, p=0.1, max_steps=10):
-    active = set(seeds)
-    new_active = set(seeds)
-    activation_timeline = [list(new_active)]
-
-    for _ in range(max_steps):
-        next_active = set()
-        for node in new_active:
-            for neighbor in G.neighbors(node):
-                if neighbor not in active and random.random() < p:
-                    next_active.add(neighbor)
-        if not next_active:
-            break
-        active.update(next_active)
-        activation_timeline.append(list(next_active))
-
-    return activation_timeline
-
-# Run the model
-random.seed(42)
-timeline = run_ic_model(G, seed_nodes, p=0.2, max_steps=7)
-
-# Positioning nodes for visualization
-pos = {idx: (data["x"], data["y"]) for idx, data in G.nodes(data=True)}
-
-# Create the color map
-cmap = cm.get_cmap('viridis', len(timeline))  # N discrete colors
-
-# Plot the graph
-plt.figure(figsize=(10, 10))
-for step, nodes in enumerate(timeline):
-    color = cmap(step)  # Get distinct color for each step
-    nx.draw_networkx_nodes(G, pos, nodelist=nodes, node_color=[color], label=f"Step {step}", node_size=40)
-
-# Draw edges
-nx.draw_networkx_edges(G, pos, alpha=0.3)
-
-# Set plot title and show
-plt.title("Independent Cascade Model Spread from Accident Hotspot")
-plt.axis('off')
-plt.legend()
-plt.tight_layout()
-
-# Save the figure
-output_path = "../Results/2C_IC_model_propagation.png"
-plt.savefig(output_path)
-print(f"IC Model figure saved at: {output_path}")
-plt.show()
-
-# Save results
-with open("../Results/2C_activation_log.txt", "w") as f:
-    for i, step_nodes in enumerate(timeline):
-        f.write(f"Step {i}: {step_nodes}\n")
+from spatial_graph import spatial_graph_from_gdf
+from snapping import NodeSnapper
+from accidents import accident_points
+from hotspots import nodes_center, check_node_coverage
+from influence import simulate_ic, celf
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.tracing import traced
+from common.rendering import draw_graph, graph_arrays, show
+
+
+# === Step 1: Intersection graph (edges between nodes within 100 m, KD-tree pairs) ===
+def intersection_graph(nodes_gdf, radius=100):
+    nodes_gdf = nodes_gdf.to_crs(epsg=27700)
+    return nodes_gdf, spatial_graph_from_gdf(nodes_gdf, radius=radius)
+
+
+def load_intersection_graph(path="network_nodes.geojson", radius=100):
+    # Load network nodes
+    return intersection_graph(gpd.read_file(path), radius=radius)
+
+
+# === Step 2: Seed nodes from the accidents in the hotspot area ===
+def hotspot_seed_nodes(nodes_gdf, accident_gdf, center, radius=500):
+    # Filter accidents within the hotspot area (buffer of 500m around a central point)
+    check_node_coverage(nodes_gdf, center, radius)
+    hotspot_area = Point(center).buffer(radius)
+    accident_hotspot = accident_gdf[accident_gdf.geometry.within(hotspot_area)]
+
+    # Nearest graph node to each accident, in one vectorized query
+    nearest_nodes, _ = NodeSnapper(nodes_gdf).nearest(accident_hotspot.geometry)
+    return set(nearest_nodes.tolist())
+
+
+# === Step 3: Independent Cascade model (batched Monte Carlo over CSR arrays, see influence.py) ===
+@traced()
+def run_ic_model(G, seeds, p=0.1, max_steps=10, seed=None):
+    # A single cascade, as an activation timeline for plotting
+    steps = simulate_ic(G, seeds, p=p, runs=1, max_steps=max_steps, seed=seed)
+    nodes = np.array(steps["nodes"])
+    timeline = [nodes[steps["steps"][0] == t].tolist() for t in range(steps["steps"].max() + 1)]
+    return timeline
+
+
+@traced()
+def influence_summary(G, seed_nodes, p=0.2, max_steps=7, seed=42):
+    """Expected spread from the hotspot seeds, and the most influential intersections (CELF)."""
+    ic_summary = simulate_ic(G, seed_nodes, p=p, runs=1000, max_steps=max_steps, seed=seed)
+    celf_seeds, celf_spread = celf(G, k=len(seed_nodes), p=p, max_steps=max_steps, seed=seed)
+    return ic_summary, celf_seeds, celf_spread
+
+
+# === Step 4: Figure and activation log ===
+def plot_cascade(G, timeline, output_path, density=False):
+    # Node coordinates and edge segments as arrays (one LineCollection, one scatter)
+    nodes, xy, segments = graph_arrays(G)
+    index = {node: i for i, node in enumerate(nodes)}
+    activated = np.array([index[n] for step_nodes in timeline for n in step_nodes], dtype=np.int64)
+    steps = np.repeat(np.arange(len(timeline)), [len(step_nodes) for step_nodes in timeline])
+
+    # Plot the graph: activated nodes coloured by step, N discrete viridis colors
+    fig, ax = plt.subplots(figsize=(10, 10))
+    draw_graph(ax, xy, segments, node_size=0, edge_color="black", edge_alpha=0.3, linewidth=1.0, density=density)
+    scatter = ax.scatter(xy[activated, 0], xy[activated, 1], c=steps, s=40, zorder=2,
+                         cmap=plt.get_cmap('viridis', len(timeline)), vmin=-0.5, vmax=len(timeline) - 0.5)
+    handles, _ = scatter.legend_elements()
+    ax.legend(handles, [f"Step {step}" for step in np.unique(steps)])
+
+    # Set plot title
+    plt.title("Independent Cascade Model Spread from Accident Hotspot")
+    plt.axis('off')
+    plt.tight_layout()
+
+    # Save the figure
+    plt.savefig(output_path)
+    print(f"IC Model figure saved at: {output_path}")
+    return fig
+
+
+def write_activation_log(path, timeline, ic_summary, celf_seeds, celf_spread):
+    with open(path, "w") as f:
+        for i, step_nodes in enumerate(timeline):
+            f.write(f"Step {i}: {step_nodes}\n")
+        f.write(f"Expected spread (hotspot seeds, 1000 runs): {ic_summary['expected_spread']:.2f}\n")
+        f.write(f"CELF seeds: {celf_seeds}\n")
+        f.write(f"Expected spread (CELF seeds): {celf_spread[-1]:.2f}\n")
+
+
+# === Main execution ===
+def main():
+    nodes_gdf, G = load_intersection_graph()
+    seed_nodes = hotspot_seed_nodes(nodes_gdf, accident_points(), nodes_center("network_nodes.geojson"))
+
+    # Run the model
+    timeline = run_ic_model(G, seed_nodes, p=0.2, max_steps=7, seed=42)
+    ic_summary, celf_seeds, celf_spread = influence_summary(G, seed_nodes, p=0.2, max_steps=7, seed=42)
+    print(f"Expected spread from {len(seed_nodes)} hotspot seeds: {ic_summary['expected_spread']:.2f}")
+    print(f"Expected spread from {len(celf_seeds)} CELF seeds: {celf_spread[-1]:.2f}", celf_seeds)
+
+    show(plot_cascade(G, timeline, "../Results/2C_IC_model_propagation.png"))
+
+    # Save results
+    write_activation_log("../Results/2C_activation_log.txt", timeline, ic_summary, celf_seeds, celf_spread)
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,27 @@
 import osmnx as ox
 import geopandas as gpd
-import networkx as nx
 import matplotlib.pyplot as plt
-from shapely.geometry import Point, Polygon
+from shapely.geometry import Point
 from scipy.spatial import Voronoi, voronoi_plot_2d
 import numpy as np
-import random
+from loop_routes import best_loops
+from voronoi_regions import assign_regions, network_regions
+from osm_graph_store import osm_graph
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.tracing import stage, describe
+from common.rendering import draw_graph, line_segments, show
+
+# Step 1: Load full Leeds road network (parsed and simplified once, then loaded from the graph store)
+def leeds_network():
+    ox.settings.log_console = True
+    with stage("osmnx_fetch") as s:
+        G = osm_graph(place="Leeds, UK", network_type="drive")
+        nodes, edges = ox.graph_to_gdfs(G)
+        s.record(**describe(G))
+    return G, nodes
 
-# Step 1: Load full Leeds road network
-ox.settings.log_console = True
-ox.settings.use_cache = True
-G = ox.graph_from_place("Leeds, UK", network_type="drive")
-nodes, edges = ox.graph_to_gdfs(G)
 
 # Step 2: Define 4 seed points (longitude, latitude)
 seeds = [
@@ -21,59 +31,72 @@ seeds = [
     (-1.510, 53.800),  # Central
 ]
 
-# Step 3: Assign Voronoi region to each node
-seed_points = [Point(xy) for xy in seeds]
-vor = Voronoi(seeds)
-node_coords = np.array([(geom.xy[0][0], geom.xy[1][0]) for geom in nodes.geometry])
-node_regions = [np.argmin([Point(c).distance(Point(xy)) for xy in seeds]) for c in node_coords]
-nodes['region'] = node_regions
 
-# Step 4: For each region, find a loop path ~42km (greedy random search)
-def find_loop(G, start_node, target_length_km=42, max_attempts=100):
-    path = [start_node]
-    total_length = 0
-    for _ in range(max_attempts):
-        neighbors = list(G.neighbors(path[-1]))
-        random.shuffle(neighbors)
-        for n in neighbors:
-            if n not in path:
-                edge_data = G.get_edge_data(path[-1], n)[0]
-                length = edge_data.get('length', 0) / 1000  # meters → km
-                if total_length + length > target_length_km * 1.05:
-                    continue
-                path.append(n)
-                total_length += length
-                if total_length >= target_length_km * 0.95 and nx.has_path(G, n, start_node):
-                    back_path = nx.shortest_path(G, n, start_node, weight='length')
-                    back_len = sum(G.get_edge_data(u, v)[0]['length'] for u, v in zip(back_path[:-1], back_path[1:])) / 1000
-                    if total_length + back_len <= target_length_km * 1.1:
-                        path.extend(back_path[1:])
-                        total_length += back_len
-                        return path, total_length
-                break
-    return None, 0
+# Step 3: Assign Voronoi region to each node (nearest seed in projected metres, one KD-tree query)
+# Pass region_mode="network" to use road-distance Voronoi cells (multi-source Dijkstra) instead
+def assign_voronoi_regions(G, nodes, region_mode="euclidean"):
+    nodes = nodes.copy()
+    with stage("projection", rows=len(nodes)):
+        seed_points = gpd.GeoSeries([Point(xy) for xy in seeds], crs="EPSG:4326").to_crs(epsg=27700)
+        nodes_proj = nodes.to_crs(epsg=27700)
+    if region_mode == "network":
+        nodes['region'], _ = network_regions(G, nodes_proj, seed_points)
+    else:
+        nodes['region'], _ = assign_regions(nodes_proj, seed_points)
+    return nodes
+
 
-fig, ax = ox.plot_graph(G, show=False, close=False)
-colors = ['red', 'blue', 'green', 'orange']
-for i in range(4):
-    sub_nodes = nodes[nodes['region'] == i]
-    subgraph = G.subgraph(sub_nodes.index)
-    try:
-        start_node = sub_nodes.sample(1).index[0]
-        loop_path, loop_len = find_loop(subgraph, start_node)
-        if loop_path:
-            ox.plot_graph_route(subgraph, loop_path, route_color=colors[i], ax=ax, show=False, close=False)
-            print(f"Region {i}: Loop path found. Length ≈ {loop_len:.2f} km")
+# Step 4: For each region, find loop paths ~42km (randomized search over a CSR graph, see loop_routes.py)
+def region_loops(G, nodes, seed=None, workers=1):
+    """{region: (loop_path, loop_len)}, or None where no loop was found; `workers` search starts in parallel."""
+    loops_by_region = {}
+    for i in range(len(seeds)):
+        sub_nodes = nodes[nodes['region'] == i]
+        subgraph = G.subgraph(sub_nodes.index)
+        # An empty region samples no starts and finds no loop; best_loops returns [] rather than raising
+        starts = sub_nodes.sample(min(8, len(sub_nodes)), random_state=seed).index
+        with stage("find_loop", region=i, **describe(subgraph)):
+            loops = best_loops(subgraph, starts, target_km=42, n_best=1, workers=workers, seed=seed)
+        if loops:
+            loops_by_region[i] = loops[0]
+            print(f"Region {i}: Loop path found. Length ≈ {loops[0][1]:.2f} km")
         else:
+            loops_by_region[i] = None
             print(f"Region {i}: No loop found.")
-    except:
-        print(f"Region {i}: Error during path search.")
+    return loops_by_region
+
+
+def plot_voronoi_loops(G, nodes, loops_by_region, output_path, density="auto", dpi=300):
+    """Street network (curved edge geometries, one LineCollection, or a density raster), loops and cells."""
+    edges = ox.graph_to_gdfs(G, nodes=False)
+    xy = np.column_stack([nodes.geometry.x, nodes.geometry.y])
+    fig, ax = plt.subplots(figsize=(8, 8), facecolor="#111111")
+    ax.set_facecolor("#111111")
+    draw_graph(ax, xy, line_segments(edges.geometry), node_color="w", node_size=15, edge_color="#999999",
+               edge_alpha=None, linewidth=1, density=density, edgecolors="none")
+    colors = ['red', 'blue', 'green', 'orange']
+    for i, loop in loops_by_region.items():
+        if loop:
+            route = nodes.loc[loop[0]]
+            ax.plot(route.geometry.x, route.geometry.y, color=colors[i], linewidth=4, alpha=0.5, zorder=3)
+
+    # Plot Voronoi diagram
+    vor = Voronoi(seeds)
+    voronoi_plot_2d(vor, ax=ax, show_vertices=False, line_colors='gray')
+    ax.set_aspect(1 / np.cos(np.radians(xy[:, 1].mean())))  # metres-true aspect in lat/lon, as OSMnx does
+    ax.set_axis_off()
+    plt.title("Voronoi Regions & 42km Loop Paths in Leeds")
+    plt.tight_layout()
+    fig.savefig(output_path, dpi=dpi)
+    print("Image saved as 'voronoi_marathon_paths_leeds.png'")
+    return fig
+
 
-# Plot Voronoi diagram
-voronoi_plot_2d(vor, ax=ax, show_vertices=False, line_colors='gray')
-plt.title("Voronoi Regions & 42km Loop Paths in Leeds")
-plt.tight_layout()
-fig.savefig("../Results/2C_voronoi_marathon_paths_leeds.png", dpi=300)
-print("Image saved as 'voronoi_marathon_paths_leeds.png'")
+def main(region_mode="euclidean", workers=1):
+    G, nodes = leeds_network()
+    nodes = assign_voronoi_regions(G, nodes, region_mode)
+    loops_by_region = region_loops(G, nodes, workers=workers)
+    show(plot_voronoi_loops(G, nodes, loops_by_region, "../Results/2C_voronoi_marathon_paths_leeds.png"))
 
-plt.show()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ACCIDENT_CSV = os.path.join(BASE_DIR, "..", "Datasets", "Traffic_accidents_2019_Leeds.csv")
+STORE_DIR = os.path.join(BASE_DIR, "store", "accidents")
+STORE_VERSION = 1
+
+# Columns that are constant per Reference Number vs. one value per casualty row
+ACCIDENT_COLUMNS = ["Grid Ref: Easting", "Grid Ref: Northing", "Number of Vehicles", "Accident Date",
+                    "Time (24hr)", "1st Road Class", "1st Road Class & No", "Road Surface",
+                    "Lighting Conditions", "Weather Conditions", "Local Authority"]
+CASUALTY_COLUMNS = ["Vehicle Number", "Type of Vehicle", "Casualty Class", "Casualty Severity",
+                    "Sex of Casualty", "Age of Casualty"]
+
+
+# === Convert the CSV once into typed columns ===
+def _file_key(csv_path):
+    h = hashlib.sha1(f"accidents-v{STORE_VERSION}".encode())
+    with open(csv_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _encode(series):
+    """(array, schema entry): downcast integers, integer codes for strings."""
+    if pd.api.types.is_numeric_dtype(series):
+        kind = "unsigned" if series.min() >= 0 else "integer"
+        return pd.to_numeric(series, downcast=kind).to_numpy(), {"kind": "numeric"}
+    codes, categories = pd.factorize(series)
+    codes = pd.to_numeric(pd.Series(codes), downcast="integer").to_numpy()
+    return codes, {"kind": "codes", "categories": [str(c) for c in categories]}
+
+
+def build_tables(df):
+    """Split casualty rows into a unique-accident table and a casualty table."""
+    accident_code, references = pd.factorize(df["Reference Number"])
+    first_rows = pd.Series(accident_code).drop_duplicates().index
+    accidents = df.iloc[first_rows][ACCIDENT_COLUMNS].reset_index(drop=True)
+    accidents.insert(0, "Reference Number", np.asarray(references, dtype=object))
+    accidents["Timestamp"] = pd.to_datetime(
+        accidents["Accident Date"] + accidents["Time (24hr)"].astype(str).str.zfill(4), format="%d/%m/%Y%H%M")
+    accidents = accidents.drop(columns=["Accident Date"])
+
+    casualties = df[CASUALTY_COLUMNS].reset_index(drop=True)
+    casualties.insert(0, "accident", accident_code)
+    return accidents, casualties
+
+
+def save_tables(tables, entry):
+    os.makedirs(os.path.dirname(entry), exist_ok=True)
+    # Unique per writer, so concurrent runs never share a half-written directory
+    tmp = tempfile.mkdtemp(prefix=os.path.basename(entry) + ".", suffix=".tmp", dir=os.path.dirname(entry))
+    schema = {}
+    for name, table in tables.items():
+        schema[name] = {}
+        for i, column in enumerate(table.columns):
+            if pd.api.types.is_datetime64_any_dtype(table[column]):
+                values, spec = table[column].to_numpy(dtype="datetime64[s]"), {"kind": "datetime"}
+            else:
+                values, spec = _encode(table[column])
+            spec["file"] = f"{name}_{i}.npy"
+            np.save(os.path.join(tmp, spec["file"]), values)
+            schema[name][column] = spec
+    with open(os.path.join(tmp, "schema.json"), "w") as f:
+        json.dump(schema, f)
+    # Entries are immutable per key: if another run published first, keep its copy
+    try:
+        if os.path.isdir(entry):
+            raise FileExistsError(entry)
+        os.replace(tmp, entry)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def load_tables(entry):
+    """Tables from the store; numeric columns are memory-mapped."""
+    with open(os.path.join(entry, "schema.json")) as f:
+        schema = json.load(f)
+    tables = {}
+    for name, columns in schema.items():
+        data = {}
+        for column, spec in columns.items():
+            values = np.load(os.path.join(entry, spec["file"]), mmap_mode="r")
+            if spec["kind"] == "codes":
+                data[column] = pd.Categorical.from_codes(np.asarray(values), spec["categories"])
+            else:
+                data[column] = values
+        tables[name] = pd.DataFrame(data, copy=False)
+    return tables
+
+
+# === Public loaders ===
+def load_accident_tables(csv_path=ACCIDENT_CSV, store_dir=STORE_DIR):
+    """(accidents, casualties): one row per accident, one row per casualty with an `accident` index."""
+    entry = os.path.join(store_dir, _file_key(csv_path))
+    if not os.path.isdir(entry):
+        accidents, casualties = build_tables(pd.read_csv(csv_path))
+        save_tables({"accidents": accidents, "casualties": casualties}, entry)
+    tables = load_tables(entry)
+    return tables["accidents"], tables["casualties"]
+
+
+def load_accident_rows(csv_path=ACCIDENT_CSV, store_dir=STORE_DIR):
+    """One row per casualty, as in the CSV, with accident columns joined back on."""
+    accidents, casualties = load_accident_tables(csv_path, store_dir)
+    rows = accidents.iloc[np.asarray(casualties["accident"])].reset_index(drop=True)
+    return pd.concat([rows, casualties.drop(columns=["accident"])], axis=1)
+
+
+def accident_points(csv_path=ACCIDENT_CSV, unique=False, crs="EPSG:27700"):
+    """Accident GeoDataFrame in British National Grid; `unique` keeps one point per accident."""
+    df = load_accident_tables(csv_path)[0] if unique else load_accident_rows(csv_path)
+    geometry = gpd.points_from_xy(df["Grid Ref: Easting"], df["Grid Ref: Northing"], crs="EPSG:27700")
+    return gpd.GeoDataFrame(df, geometry=geometry, crs="EPSG:27700").to_crs(crs)
@@ -1,18 +1,33 @@
 import osmnx as ox
 import geopandas as gpd
+from hotspots import hotspot_center, save_nodes_center
+from osm_graph_store import osm_graph
 
-# Define the hotspot center coordinates (Easting, Northing in EPSG:27700)
-center_easting, center_northing = 430000, 433500
 
-# Convert to WGS84 (longitude, latitude) for OSMnx
-gdf_point = gpd.GeoSeries.from_xy([center_easting], [center_northing], crs="EPSG:27700").to_crs(epsg=4326)
-lon, lat = gdf_point.geometry.x[0], gdf_point.geometry.y[0]
+def extract_intersection_nodes(center, dist=500):
+    """Drive-network nodes (WGS84 GeoDataFrame) within `dist` m of an EPSG:27700 (easting, northing) centre."""
+    center_easting, center_northing = center
 
-G = ox.graph_from_point((lat, lon), dist=500, network_type="drive")
+    # Convert to WGS84 (longitude, latitude) for OSMnx
+    gdf_point = gpd.GeoSeries.from_xy([center_easting], [center_northing], crs="EPSG:27700").to_crs(epsg=4326)
+    lon, lat = gdf_point.geometry.x[0], gdf_point.geometry.y[0]
 
-# Extract intersection nodes (network nodes)
-nodes, _ = ox.graph_to_gdfs(G)
+    G = osm_graph(point=(lat, lon), dist=dist, network_type="drive")  # served from Part2/store after the first run
 
-# Save to GeoJSON file for further analysis in Task B
-nodes.to_file("network_nodes.geojson", driver="GeoJSON")
-print("Intersection nodes saved as 'network_nodes.geojson'. Total nodes:", len(nodes))
+    # Extract intersection nodes (network nodes)
+    nodes, _ = ox.graph_to_gdfs(G)
+    return nodes
+
+
+def main():
+    # Study box centre (Easting, Northing in EPSG:27700): the densest 1 km accident cell
+    center = hotspot_center()
+    nodes = extract_intersection_nodes(center)
+
+    # Save to GeoJSON file for further analysis in Task B, with the centre TaskA-C read back
+    nodes.to_file("network_nodes.geojson", driver="GeoJSON")
+    save_nodes_center("network_nodes.geojson", center)
+    print("Intersection nodes saved as 'network_nodes.geojson'. Total nodes:", len(nodes))
+
+if __name__ == "__main__":
+    main()
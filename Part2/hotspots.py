@@ -0,0 +1,117 @@
+import os
+import json
+import warnings
+import numpy as np
+import pandas as pd
+from scipy.signal import fftconvolve
+
+CELL_SIZES = (1000, 500, 250)  # metres, EPSG:27700
+
+# The 1 km study box is centred on hotspot_center(); extract_intersections records that centre next
+# to the node file it writes. Fallback for node files without that record, i.e. the checked-in
+# network_nodes.geojson: the centre it was extracted around, 500 m west of the detector's cell.
+GEOJSON_CENTER = (430000.0, 433500.0)
+
+
+# === 2D histogram with integer binning on a grid aligned to the cell size ===
+def grid_counts(x, y, cell_size):
+    """Counts per cell and the grid origin; cell (i, j) spans origin + (i, j) * cell_size."""
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    origin = np.floor([x.min() / cell_size, y.min() / cell_size]) * cell_size
+    ix = ((x - origin[0]) // cell_size).astype(np.int64)
+    iy = ((y - origin[1]) // cell_size).astype(np.int64)
+    shape = (ix.max() + 1, iy.max() + 1)
+    counts = np.bincount(ix * shape[1] + iy, minlength=shape[0] * shape[1]).reshape(shape)
+    return counts, origin
+
+
+def kernel_density(counts, bandwidth_cells):
+    """Gaussian-smoothed counts via FFT convolution (same shape as `counts`)."""
+    radius = max(int(np.ceil(3 * bandwidth_cells)), 1)
+    offsets = np.arange(-radius, radius + 1)
+    kernel = np.exp(-(offsets[:, None] ** 2 + offsets[None, :] ** 2) / (2 * bandwidth_cells ** 2))
+    density = fftconvolve(counts.astype(float), kernel / kernel.sum(), mode="same")
+    return np.maximum(density, 0)
+
+
+def top_cells(score, k, separation):
+    """Greedy top-k cells whose Chebyshev distance from each other is >= `separation`."""
+    flat = score.ravel()
+    candidates = min(len(flat), k * (2 * separation + 1) ** 2)
+    order = np.argpartition(-flat, candidates - 1)[:candidates]
+    order = order[np.argsort(-flat[order], kind="stable")]
+    chosen = []
+    for cell in order:
+        if flat[cell] <= 0 or len(chosen) == k:
+            break
+        i, j = divmod(int(cell), score.shape[1])
+        if all(max(abs(i - a), abs(j - b)) >= separation for a, b in chosen):
+            chosen.append((i, j))
+    return chosen
+
+
+# === Multi-resolution top-k hotspots ===
+def detect_hotspots(x, y, cell_sizes=CELL_SIZES, k=5, bandwidth=None, separation=2):
+    """Top-k non-overlapping hotspot cells at each resolution.
+
+    Cells are ranked by raw count, or by Gaussian kernel density when `bandwidth`
+    (metres) is given. Chosen cells are at least `separation` cells apart so
+    neighbouring cells of the same cluster are not reported twice. Returns one row per
+    hotspot with its cell centre (x, y), count and density.
+    """
+    rows = []
+    for cell_size in cell_sizes:
+        counts, origin = grid_counts(x, y, cell_size)
+        density = counts.astype(float) if bandwidth is None else kernel_density(counts, bandwidth / cell_size)
+        for rank, (i, j) in enumerate(top_cells(density, k, separation)):
+            rows.append({
+                "cell_size": cell_size,
+                "rank": rank,
+                "x": origin[0] + (i + 0.5) * cell_size,
+                "y": origin[1] + (j + 0.5) * cell_size,
+                "count": int(counts[i, j]),
+                "density": float(density[i, j]) / (cell_size / 1000) ** 2,  # per km²
+            })
+    return pd.DataFrame(rows, columns=["cell_size", "rank", "x", "y", "count", "density"])
+
+
+def hotspot_center(gdf=None, cell_size=1000):
+    """Centre (easting, northing) of the densest accident cell; replaces hard-coded centres."""
+    if gdf is None:
+        from accidents import accident_points
+        gdf = accident_points()
+    top = detect_hotspots(gdf.geometry.x, gdf.geometry.y, cell_sizes=(cell_size,), k=1).iloc[0]
+    return float(top["x"]), float(top["y"])
+
+
+# === Study box centre recorded next to an extracted node file ===
+def nodes_center_path(nodes_path):
+    return os.path.splitext(nodes_path)[0] + ".center.json"
+
+
+def save_nodes_center(nodes_path, center):
+    with open(nodes_center_path(nodes_path), "w", encoding="utf-8") as f:
+        json.dump([float(c) for c in center], f)
+
+
+def nodes_center(nodes_path="network_nodes.geojson"):
+    """(easting, northing) the node file was extracted around; GEOJSON_CENTER if it has no record."""
+    path = nodes_center_path(nodes_path)
+    if not os.path.exists(path):
+        return GEOJSON_CENTER
+    with open(path, encoding="utf-8") as f:
+        return tuple(json.load(f))
+
+
+# === Do the loaded network nodes cover the study box? ===
+def check_node_coverage(nodes_gdf, center, radius=500, min_fraction=0.5):
+    """Share of the box around `center` spanned by the nodes' extent; warns below `min_fraction`."""
+    xmin, ymin, xmax, ymax = nodes_gdf.to_crs(epsg=27700).total_bounds
+    cx, cy = center
+    width = max(0.0, min(xmax, cx + radius) - max(xmin, cx - radius))
+    height = max(0.0, min(ymax, cy + radius) - max(ymin, cy - radius))
+    fraction = width * height / (2 * radius) ** 2
+    if fraction < min_fraction:
+        warnings.warn(f"Network nodes cover only {fraction:.0%} of the {2 * radius} m box around {center}; "
+                      "rerun extract_intersections.py for this centre", stacklevel=2)
+    return fraction
@@ -0,0 +1,137 @@
+import heapq
+import numpy as np
+import networkx as nx
+from collections import OrderedDict
+
+ROW_BUDGET = 2 ** 24  # cascade rows x edges evaluated per batch
+MAX_CACHE_BYTES = 64 * 1024 ** 2  # bit-packed reach sets kept by InfluenceOracle
+
+
+# === CSR arrays with per-edge activation probabilities ===
+def ic_arrays(G, p=0.1):
+    """(nodes, indptr, indices, probs) for G; `p` is a constant or an edge attribute name."""
+    nodes = list(G.nodes())
+    A = nx.to_scipy_sparse_array(G, nodelist=nodes, weight=p if isinstance(p, str) else None, format="csr")
+    probs = A.data.astype(float) if isinstance(p, str) else np.full(A.nnz, float(p))
+    return nodes, A.indptr, A.indices, probs
+
+
+# === Batched cascades over live-edge samples ===
+def sample_live_edges(probs, runs, rng):
+    """Each edge attempt succeeds independently, so one live-edge draw per run fixes a cascade."""
+    return rng.random((runs, len(probs))) < probs
+
+
+def cascade_steps(indptr, indices, live, seed_mask, max_steps):
+    """Activation step per (run, node): 0 for seeds, -1 if never activated.
+
+    Newly activated nodes try each inactive neighbour once, via the pre-drawn live edges.
+    """
+    n = len(indptr) - 1
+    src = np.repeat(np.arange(n), np.diff(indptr))
+    step = np.where(seed_mask, 0, -1).astype(np.int16)
+    frontier = seed_mask.copy()
+    for t in range(1, max_steps + 1):
+        runs, edges = np.nonzero(frontier[:, src] & live)
+        newly = np.zeros_like(frontier)
+        newly[runs, indices[edges]] = True
+        newly &= step < 0
+        if not newly.any():
+            break
+        step[newly] = t
+        frontier = newly
+    return step
+
+
+def simulate_ic(G, seeds, p=0.1, runs=1000, max_steps=10, seed=None):
+    """Monte Carlo IC from `seeds`: expected spread, spread std, per-node activation probability
+    and the (runs x nodes) activation steps."""
+    nodes, indptr, indices, probs = ic_arrays(G, p)
+    index = {node: i for i, node in enumerate(nodes)}
+    rng = np.random.default_rng(seed)
+    batch = max(1, ROW_BUDGET // max(len(probs), 1))
+
+    steps = []
+    for start in range(0, runs, batch):
+        size = min(batch, runs - start)
+        seed_mask = np.zeros((size, len(nodes)), dtype=bool)
+        seed_mask[:, [index[s] for s in seeds]] = True
+        steps.append(cascade_steps(indptr, indices, sample_live_edges(probs, size, rng), seed_mask, max_steps))
+    steps = np.vstack(steps)
+    active = steps >= 0
+    spread = active.sum(axis=1)
+    return {
+        "nodes": nodes,
+        "expected_spread": float(spread.mean()),
+        "spread_std": float(spread.std()),
+        "activation_probability": dict(zip(nodes, active.mean(axis=0))),
+        "steps": steps,
+    }
+
+
+# === CELF seed selection with shared Monte Carlo samples ===
+class InfluenceOracle:
+    """Spread estimates over one fixed set of live-edge samples (common random numbers).
+
+    Reach sets of single nodes are cached (bit-packed, LRU within `max_cache_bytes`) so
+    greedy rounds reuse them; since IC reach within `max_steps` hops is a union of per-seed
+    reaches, marginal gains only need the covered mask of the current seed set.
+    """
+
+    def __init__(self, G, p=0.1, runs=200, max_steps=10, seed=None, max_cache_bytes=MAX_CACHE_BYTES):
+        self.nodes, self.indptr, self.indices, probs = ic_arrays(G, p)
+        self.runs, self.max_steps, self.max_cache_bytes = runs, max_steps, max_cache_bytes
+        self.live = sample_live_edges(probs, runs, np.random.default_rng(seed))
+        self.covered = np.zeros((runs, len(self.nodes)), dtype=bool)
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
+        self.evaluations = 0
+
+    def reach(self, v):
+        """(runs x nodes) bool mask of nodes activated from seed index `v`."""
+        n = len(self.nodes)
+        if v in self._cache:
+            self._cache.move_to_end(v)
+            return np.unpackbits(self._cache[v], count=self.runs * n).reshape(self.runs, n).astype(bool)
+        seed_mask = np.zeros((self.runs, n), dtype=bool)
+        seed_mask[:, v] = True
+        mask = cascade_steps(self.indptr, self.indices, self.live, seed_mask, self.max_steps) >= 0
+        self.evaluations += 1
+        self._cache[v] = packed = np.packbits(mask)
+        self._cache_bytes += packed.nbytes
+        while self._cache_bytes > self.max_cache_bytes and self._cache:
+            _, old = self._cache.popitem(last=False)
+            self._cache_bytes -= old.nbytes
+        return mask
+
+    def gain(self, v):
+        return float((self.reach(v) & ~self.covered).sum() / self.runs)
+
+    def add(self, v):
+        self.covered |= self.reach(v)
+        return float(self.covered.sum() / self.runs)
+
+
+def celf(G, k, p=0.1, runs=200, max_steps=10, candidates=None, budget=None, seed=None):
+    """Lazy-greedy (CELF) choice of the k most influential nodes.
+
+    `budget` caps the number of reach simulations after the initial pass over the
+    candidates; once it is spent, remaining picks use the latest (stale) upper bounds.
+    Returns (seeds, expected spread after each pick).
+    """
+    oracle = InfluenceOracle(G, p=p, runs=runs, max_steps=max_steps, seed=seed)
+    index = {node: i for i, node in enumerate(oracle.nodes)}
+    pool = [index[c] for c in (oracle.nodes if candidates is None else candidates)]
+    budget = np.inf if budget is None else len(pool) + budget
+
+    queue = [(-oracle.gain(v), v, 0) for v in pool]
+    heapq.heapify(queue)
+    seeds, spreads = [], []
+    while queue and len(seeds) < k:
+        neg_gain, v, round_seen = heapq.heappop(queue)
+        if round_seen == len(seeds) or oracle.evaluations >= budget:
+            seeds.append(oracle.nodes[v])
+            spreads.append(oracle.add(v))
+        else:
+            heapq.heappush(queue, (-oracle.gain(v), v, len(seeds)))
+    return seeds, spreads
@@ -0,0 +1,108 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from scipy import sparse
+from scipy.sparse import csgraph
+
+MIN_LENGTH = 1e-6  # metres; keeps zero-length edges as explicit CSR entries
+
+
+# === CSR routing core ===
+def graph_csr(G, weight="length"):
+    """(nodes, CSR of edge lengths in metres) for an OSMnx graph; parallel edges keep the shortest."""
+    nodes = list(G.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+    edges = np.array([(index[u], index[v], max(float(w or 0), MIN_LENGTH))
+                      for u, v, w in G.edges(data=weight)], dtype=float).reshape(-1, 3)
+    u, v, w = edges[:, 0].astype(np.int64), edges[:, 1].astype(np.int64), edges[:, 2]
+    order = np.lexsort((w, v, u))
+    u, v, w = u[order], v[order], w[order]
+    first = np.ones(len(u), dtype=bool)
+    first[1:] = (u[1:] != u[:-1]) | (v[1:] != v[:-1])
+    A = sparse.csr_matrix((w[first], (u[first], v[first])), shape=(len(nodes), len(nodes)))
+    return nodes, A
+
+
+def distances_back(A, start):
+    """Shortest distance from every node back to `start`, and each node's next hop on that path."""
+    dist, pred = csgraph.dijkstra(A.T.tocsr(), directed=True, indices=start, return_predecessors=True)
+    return dist, pred
+
+
+# === Randomized loop search with length-window pruning ===
+def find_loop(A, start, back_dist, back_next, target_m, rng, max_steps=100):
+    """One randomized depth-first search from `start` for a loop of about `target_m` metres.
+
+    Same rules as the original greedy search (forward part <= 105% of the target,
+    close once >= 95% and the loop fits in 110%), but visits are tracked in a set, a
+    step is skipped when even the shortest way back would overshoot 110%, and dead
+    ends backtrack instead of ending the attempt. `max_steps` bounds the expansions.
+    """
+    indptr, indices, lengths = A.indptr, A.indices, A.data
+
+    def options(u):
+        return iter(indptr[u] + rng.permutation(indptr[u + 1] - indptr[u]))
+
+    path, steps, visited, total = [start], [], {start}, 0.0
+    frontier = [options(start)]
+    for _ in range(max_steps):
+        if not frontier:
+            break
+        for j in frontier[-1]:
+            n = int(indices[j])
+            step = lengths[j]
+            if n in visited or total + step > target_m * 1.05 or total + step + back_dist[n] > target_m * 1.1:
+                continue
+            path.append(n)
+            steps.append(step)
+            visited.add(n)
+            total += step
+            if total >= target_m * 0.95:
+                back = [n]
+                while back[-1] != start:
+                    back.append(int(back_next[back[-1]]))
+                return path + back[1:], float(total + back_dist[n])
+            frontier.append(options(n))
+            break
+        else:
+            # Dead end: step back (the node stays visited, so it is not retried)
+            frontier.pop()
+            if steps:
+                path.pop()
+                total -= steps.pop()
+    return None, 0.0
+
+
+def _search_start(A, start, target_m, attempts, max_steps, seed):
+    back_dist, back_next = distances_back(A, start)
+    rng = np.random.default_rng(seed)
+    loops = []
+    for _ in range(attempts):
+        path, length = find_loop(A, start, back_dist, back_next, target_m, rng, max_steps)
+        if path is not None:
+            loops.append((path, length))
+    return loops
+
+
+def best_loops(G, starts, target_km=42, attempts=50, max_steps=2000, tolerance=0.1, n_best=3,
+               workers=1, seed=None):
+    """Best loops (node paths, length in km) from many starts, closest to the target first.
+
+    Starts are searched in parallel; each computes one reverse Dijkstra and reuses it
+    for all of its `attempts` walks.
+    """
+    nodes, A = graph_csr(G)
+    index = {node: i for i, node in enumerate(nodes)}
+    starts = [index[s] for s in starts]
+    seeds = np.random.SeedSequence(seed).spawn(len(starts))
+    args = ([A] * len(starts), starts, [target_km * 1000] * len(starts), [attempts] * len(starts),
+            [max_steps] * len(starts), seeds)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_search_start, *args))
+    else:
+        results = [_search_start(*a) for a in zip(*args)]
+
+    loops = [(path, length / 1000) for found in results for path, length in found
+             if abs(length / 1000 - target_km) <= tolerance * target_km]
+    loops.sort(key=lambda loop: abs(loop[1] - target_km))
+    return [([nodes[i] for i in path], length) for path, length in loops[:n_best]]
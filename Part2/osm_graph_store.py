@@ -0,0 +1,249 @@
+import os
+import json
+import shutil
+import hashlib
+import numpy as np
+import networkx as nx
+import shapely
+from shapely.geometry.base import BaseGeometry
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STORE_DIR = os.path.join(BASE_DIR, "store", "graphs")
+RAW_CACHE_DIR = os.path.join(BASE_DIR, "cache")  # OSMnx HTTP cache (raw Overpass JSON)
+MAX_STORE_BYTES = 512 * 1024 ** 2
+MAX_RAW_CACHE_BYTES = 256 * 1024 ** 2
+STORE_PARAMS = {"format": "columns", "version": 1}
+
+
+# === Query keys: place / bbox / point+dist, network type and projection ===
+def _json_value(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def query_key(query):
+    payload = dict(query, **STORE_PARAMS)
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=_json_value).encode()).hexdigest()
+
+
+# === Attribute columns: numeric -> .npy, geometry -> WKB blob, anything else -> JSON ===
+def _is_number(value):
+    return isinstance(value, (bool, int, float, np.number))
+
+
+def _write_columns(folder, prefix, records):
+    """Store one column per attribute name over `records` (dicts); missing values are skipped on load."""
+    names = sorted({name for record in records for name in record})
+    schema, text = {}, {}
+    for i, name in enumerate(names):
+        values = [record.get(name) for record in records]
+        present = [v for v in values if v is not None]
+        if present and all(isinstance(v, BaseGeometry) for v in present):
+            wkb = [b"" if v is None else shapely.to_wkb(v) for v in values]
+            np.save(os.path.join(folder, f"{prefix}{i}_offsets.npy"), np.cumsum([0] + [len(b) for b in wkb]))
+            with open(os.path.join(folder, f"{prefix}{i}.wkb"), "wb") as f:
+                f.write(b"".join(wkb))
+            schema[name] = {"file": f"{prefix}{i}", "kind": "wkb"}
+        elif present and all(_is_number(v) for v in present):
+            if all(isinstance(v, (bool, np.bool_)) for v in present):
+                kind = "bool"
+            elif len(present) == len(values) and all(isinstance(v, (int, np.integer)) for v in present):
+                kind = "int"
+            else:
+                kind = "float"  # None -> NaN
+            data = np.array([np.nan if v is None else v for v in values], dtype=float if kind != "int" else np.int64)
+            np.save(os.path.join(folder, f"{prefix}{i}.npy"), data)
+            schema[name] = {"file": f"{prefix}{i}", "kind": kind}
+        else:
+            text[name] = values
+            schema[name] = {"kind": "json"}
+    with open(os.path.join(folder, f"{prefix}text.json"), "w", encoding="utf-8") as f:
+        json.dump(text, f, ensure_ascii=False, default=_json_value)
+    return schema
+
+
+def _read_columns(folder, prefix, schema, n):
+    """Per-record attribute dicts rebuilt from the stored columns."""
+    with open(os.path.join(folder, f"{prefix}text.json"), encoding="utf-8") as f:
+        text = json.load(f)
+    records = [{} for _ in range(n)]
+    for name, spec in schema.items():
+        kind = spec["kind"]
+        if kind == "json":
+            values = text[name]
+            present = [v is not None for v in values]
+        elif kind == "wkb":
+            offsets = np.load(os.path.join(folder, spec["file"] + "_offsets.npy"))
+            with open(os.path.join(folder, spec["file"] + ".wkb"), "rb") as f:
+                blob = f.read()
+            present = np.diff(offsets) > 0
+            values = np.empty(n, dtype=object)
+            values[present] = shapely.from_wkb([blob[a:b] for a, b, p in zip(offsets[:-1], offsets[1:], present) if p])
+        else:
+            data = np.load(os.path.join(folder, spec["file"] + ".npy"))
+            present = ~np.isnan(data) if kind != "int" else np.ones(n, dtype=bool)
+            values = data.astype(bool).tolist() if kind == "bool" else data.tolist()
+        for record, value, keep in zip(records, values, present):
+            if keep:
+                record[name] = value
+    return records
+
+
+# === Save / load one simplified graph as node and edge arrays ===
+def save_graph(key, G, store_dir=STORE_DIR):
+    entry = os.path.join(store_dir, key)
+    tmp = entry + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    nodes = list(G.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+    edges = list(G.edges(keys=True, data=True))
+
+    np.save(os.path.join(tmp, "node_ids.npy"), np.array(nodes, dtype=np.int64))
+    np.save(os.path.join(tmp, "edge_u.npy"), np.array([index[u] for u, _, _, _ in edges], dtype=np.int64))
+    np.save(os.path.join(tmp, "edge_v.npy"), np.array([index[v] for _, v, _, _ in edges], dtype=np.int64))
+    np.save(os.path.join(tmp, "edge_key.npy"), np.array([k for _, _, k, _ in edges], dtype=np.int64))
+    schema = {
+        "graph": {name: _json_value(value) if not isinstance(value, (str, int, float, bool)) else value
+                  for name, value in G.graph.items()},
+        "nodes": _write_columns(tmp, "n", [data for _, data in G.nodes(data=True)]),
+        "edges": _write_columns(tmp, "e", [data for _, _, _, data in edges]),
+    }
+    with open(os.path.join(tmp, "schema.json"), "w", encoding="utf-8") as f:
+        json.dump(schema, f, ensure_ascii=False)
+    shutil.rmtree(entry, ignore_errors=True)
+    os.replace(tmp, entry)
+
+
+def load_graph(key, store_dir=STORE_DIR):
+    """MultiDiGraph for a stored key, or None on a miss. No Overpass call, no JSON response parsing."""
+    entry = os.path.join(store_dir, key)
+    if not os.path.isdir(entry):
+        return None
+    with open(os.path.join(entry, "schema.json"), encoding="utf-8") as f:
+        schema = json.load(f)
+    node_ids = np.load(os.path.join(entry, "node_ids.npy")).tolist()
+    u, v, k = (np.load(os.path.join(entry, f"edge_{name}.npy")).tolist() for name in ("u", "v", "key"))
+    node_attrs = _read_columns(entry, "n", schema["nodes"], len(node_ids))
+    edge_attrs = _read_columns(entry, "e", schema["edges"], len(u))
+    os.utime(entry)  # mark as recently used for eviction
+
+    G = nx.MultiDiGraph(**schema["graph"])
+    G.add_nodes_from(zip(node_ids, node_attrs))
+    G.add_edges_from((node_ids[a], node_ids[b], key, attrs) for a, b, key, attrs in zip(u, v, k, edge_attrs))
+    return G
+
+
+# === Size-bounded eviction (least recently used first) ===
+def evict(store_dir=STORE_DIR, max_bytes=MAX_STORE_BYTES):
+    if not os.path.isdir(store_dir):
+        return
+    entries = []
+    for name in os.listdir(store_dir):
+        entry = os.path.join(store_dir, name)
+        if os.path.isdir(entry) and not name.endswith(".tmp"):
+            size = sum(os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry))
+            entries.append((os.path.getmtime(entry), size, entry))
+    total = sum(size for _, size, _ in entries)
+    for _, size, entry in sorted(entries):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= size
+
+
+# === Raw HTTP cache: hardlink identical responses, then trim to a size limit ===
+def _file_digest(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def dedupe_raw_cache(cache_dir=RAW_CACHE_DIR):
+    """Replace byte-identical response files with hardlinks to one copy; returns bytes saved."""
+    if not os.path.isdir(cache_dir):
+        return 0
+    by_size = {}
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if os.path.isfile(path):
+            by_size.setdefault(os.path.getsize(path), []).append(path)
+    saved = 0
+    for size, paths in by_size.items():
+        if len(paths) < 2:
+            continue
+        first = {}
+        for path in sorted(paths):
+            original = first.setdefault(_file_digest(path), path)
+            if original == path or os.path.samefile(original, path):
+                continue
+            tmp = path + ".link"
+            os.link(original, tmp)
+            os.replace(tmp, path)
+            saved += size
+    return saved
+
+
+def evict_raw_cache(cache_dir=RAW_CACHE_DIR, max_bytes=MAX_RAW_CACHE_BYTES):
+    """Drop least recently used responses until the cache fits; hardlinked copies count once."""
+    if not os.path.isdir(cache_dir):
+        return
+    files, inodes = [], {}
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if os.path.isfile(path):
+            st = os.stat(path)
+            files.append((max(st.st_atime, st.st_mtime), st.st_ino, path))
+            inodes[st.st_ino] = st.st_size
+    total = sum(inodes.values())
+    links = {}
+    for _, ino, _ in files:
+        links[ino] = links.get(ino, 0) + 1
+    for _, ino, path in sorted(files):
+        if total <= max_bytes:
+            break
+        os.remove(path)
+        links[ino] -= 1
+        if links[ino] == 0:
+            total -= inodes[ino]
+
+
+# === Cached graph download ===
+def osm_graph(place=None, bbox=None, point=None, dist=None, network_type="drive", project=False,
+              store_dir=STORE_DIR, max_bytes=MAX_STORE_BYTES):
+    """Simplified OSMnx graph for a place name, bbox or point + dist, optionally projected.
+
+    `project=True` projects to the local UTM zone; a CRS string (e.g. "EPSG:27700")
+    projects to that CRS. Built once through OSMnx (with its HTTP cache in Part2/cache) and then served from
+    the graph store.
+    """
+    query = {"place": place, "bbox": bbox, "point": point, "dist": dist,
+             "network_type": network_type, "project": project}
+    key = query_key(query)
+    G = load_graph(key, store_dir)
+    if G is not None:
+        return G
+
+    import osmnx as ox
+
+    ox.settings.use_cache = True
+    ox.settings.cache_folder = RAW_CACHE_DIR
+    if place is not None:
+        G = ox.graph_from_place(place, network_type=network_type)
+    elif bbox is not None:
+        G = ox.graph_from_bbox(bbox, network_type=network_type)
+    else:
+        G = ox.graph_from_point(point, dist=dist, network_type=network_type)
+    if project is True:
+        G = ox.project_graph(G)
+    elif project:
+        G = ox.project_graph(G, to_crs=project)
+
+    save_graph(key, G, store_dir)
+    evict(store_dir, max_bytes)
+    dedupe_raw_cache()
+    evict_raw_cache()
+    return G
@@ -0,0 +1,363 @@
+import os
+import sys
+import json
+import time
+import pickle
+import hashlib
+import inspect
+import argparse
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
+matplotlib.use("Agg")  # stages only save figures; nothing is shown
+import matplotlib.pyplot as plt
+import geopandas as gpd
+from accidents import ACCIDENT_CSV, accident_points
+from hotspots import detect_hotspots, hotspot_center, nodes_center, nodes_center_path, save_nodes_center
+from hotspots import check_node_coverage
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.tracing import stage as trace_stage, write_trace
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STORE_DIR = os.path.join(BASE_DIR, "store", "pipeline")
+RESULTS_DIR = os.path.join(BASE_DIR, "..", "Results")
+NODES_GEOJSON = os.path.join(BASE_DIR, "network_nodes.geojson")
+
+
+# === Stage declaration ===
+class Stage:
+    """One pipeline step: `fn(*upstream artifacts, **params)` returns this stage's artifact.
+
+    `inputs` are upstream stage names, `files` the input files it reads, `outputs` the files it
+    writes and `modules` the Part2 modules whose source it depends on. `figure` stages only render
+    outputs; they are held back to the last level so all PNGs render side by side.
+    """
+
+    def __init__(self, name, fn, inputs=(), params=None, files=(), outputs=(), modules=(), figure=False):
+        self.name, self.fn, self.figure = name, fn, figure
+        self.inputs, self.params = tuple(inputs), dict(params or {})
+        self.files, self.outputs, self.modules = tuple(files), tuple(outputs), tuple(modules)
+
+
+# === Fingerprints: parameters, input file contents, code and upstream fingerprints ===
+_digests = {}
+
+
+def _file_digest(path):
+    if not os.path.exists(path):
+        return "missing"
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    if key not in _digests:
+        h = hashlib.sha1()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        _digests[key] = h.hexdigest()
+    return _digests[key]
+
+
+def fingerprint(st, upstream):
+    """Hash of everything the stage's artifact depends on; `upstream` maps stage name -> fingerprint."""
+    h = hashlib.sha1(st.name.encode())
+    h.update(json.dumps(st.params, sort_keys=True, default=str).encode())
+    h.update(inspect.getsource(st.fn).encode())
+    for module in st.modules:
+        h.update(_file_digest(os.path.join(BASE_DIR, module + ".py")).encode())
+    for path in st.files:
+        h.update(_file_digest(path).encode())
+    for name in st.inputs:
+        h.update(upstream[name].encode())
+    return h.hexdigest()
+
+
+# === Runner ===
+def _execute(fn, args, params):
+    start = time.perf_counter()
+    result = fn(*args, **params)
+    plt.close("all")
+    return result, time.perf_counter() - start
+
+
+def _execute_in_worker(name, fn, args, params):
+    with trace_stage(name):
+        result = _execute(fn, args, params)
+    write_trace()  # pool workers do not run atexit handlers
+    return result
+
+
+class Pipeline:
+    """Runs the stages a set of targets needs, skipping those whose fingerprint is already stored.
+
+    Artifacts travel between stages in memory and are pickled to the store once computed; a cached
+    artifact is only loaded when a stale stage downstream of it has to run.
+    """
+
+    def __init__(self, stages, store_dir=STORE_DIR):
+        self.stages = {s.name: s for s in stages}
+        self.store_dir = store_dir
+
+    def levels(self, targets=None):
+        """Stages needed for `targets` (default: all), grouped so each group only depends on earlier ones."""
+        needed, todo = set(), list(targets or self.stages)
+        while todo:
+            name = todo.pop()
+            if name not in needed:
+                needed.add(name)
+                todo.extend(self.stages[name].inputs)
+        depth = {}
+
+        def level_of(name):
+            if name not in depth:
+                depth[name] = 1 + max((level_of(i) for i in self.stages[name].inputs), default=-1)
+            return depth[name]
+
+        last = max(level_of(n) for n in needed)
+        levels = [[] for _ in range(1 + last)]
+        for name in self.stages:  # declaration order within a level
+            if name in needed:
+                levels[last if self.stages[name].figure else depth[name]].append(name)
+        return [level for level in levels if level]
+
+    def _entry(self, name, fp):
+        return os.path.join(self.store_dir, f"{name}-{fp}.pkl")
+
+    def _save(self, name, fp, artifact):
+        os.makedirs(self.store_dir, exist_ok=True)
+        entry = self._entry(name, fp)
+        tmp = f"{entry}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, entry)
+        for old in os.listdir(self.store_dir):  # one stored artifact per stage
+            if old.startswith(name + "-") and old.endswith(".pkl") and old != os.path.basename(entry):
+                os.remove(os.path.join(self.store_dir, old))
+
+    def run(self, targets=None, workers=1, force=()):
+        """({target: artifact} for the named targets, [(stage, "cached" | "ran", seconds)])."""
+        fingerprints, artifacts, report = {}, {}, []
+
+        def artifact(name):
+            if name not in artifacts:
+                with open(self._entry(name, fingerprints[name]), "rb") as f:
+                    artifacts[name] = pickle.load(f)
+            return artifacts[name]
+
+        for level in self.levels(targets):
+            stale = []
+            for name in level:
+                st = self.stages[name]
+                fingerprints[name] = fingerprint(st, fingerprints)
+                fresh = (os.path.exists(self._entry(name, fingerprints[name]))
+                         and all(os.path.exists(path) for path in st.outputs))
+                if fresh and name not in force:
+                    report.append((name, "cached", 0.0))
+                else:
+                    stale.append(name)
+            calls = {name: (self.stages[name].fn, [artifact(i) for i in self.stages[name].inputs],
+                            self.stages[name].params) for name in stale}
+
+            # Independent stages of one level run side by side
+            if workers > 1 and len(stale) > 1:
+                with ProcessPoolExecutor(max_workers=min(workers, len(stale))) as pool:
+                    futures = {name: pool.submit(_execute_in_worker, name, *call) for name, call in calls.items()}
+                    results = {name: future.result() for name, future in futures.items()}
+            else:
+                results = {}
+                for name, call in calls.items():
+                    with trace_stage(name):
+                        results[name] = _execute(*call)
+            for name in stale:
+                artifacts[name], seconds = results[name]
+                self._save(name, fingerprints[name], artifacts[name])
+                report.append((name, "ran", seconds))
+        return {name: artifact(name) for name in targets or ()}, report
+
+
+# === Part2 stages (wrapping the step functions of each script) ===
+_scripts = {}
+
+
+def _script(filename):
+    """Import a Part2 script by file name (some have spaces in them); OSMnx is only imported when needed."""
+    if filename not in _scripts:
+        spec = importlib.util.spec_from_file_location(os.path.splitext(filename)[0].replace(" ", "_"),
+                                                      os.path.join(BASE_DIR, filename))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _scripts[filename] = module
+    return _scripts[filename]
+
+
+def load_accidents():
+    return accident_points()
+
+
+def find_hotspots(gdf, k=5, center=None):
+    """Top-k table and the study box centre: the densest 1 km cell unless a node file fixes `center`."""
+    center = tuple(center) if center is not None else hotspot_center(gdf)
+    return {"table": detect_hotspots(gdf.geometry.x, gdf.geometry.y, k=k), "center": center}
+
+
+def intersection_nodes(hotspots, dist=500):
+    nodes = _script("extract_intersections.py").extract_intersection_nodes(hotspots["center"], dist=dist)
+    nodes.to_file(NODES_GEOJSON, driver="GeoJSON")  # still read by the standalone scripts
+    save_nodes_center(NODES_GEOJSON, hotspots["center"])
+    return nodes.reset_index()  # same columns as network_nodes.geojson read back
+
+
+def intersection_nodes_from_file(path):
+    return gpd.read_file(path)
+
+
+def hotspot_network(hotspots, dist=500):
+    task_a = _script("TaskA.py")
+    center_latlon, bbox = task_a.study_bbox(hotspots["center"], dist=dist)
+    G = task_a.osm_graph(bbox=bbox, network_type="drive")
+    G_proj = task_a.osm_graph(bbox=bbox, network_type="drive", project=True)
+    stats = task_a.network_stats(G, G_proj)
+    task_a.ox.plot_graph(G, bgcolor='white', node_color='red', edge_color='gray', save=True,
+                         filepath=os.path.join(RESULTS_DIR, "2A_taskd_osmnx_network.png"), dpi=300,
+                         show=False, close=True)
+    return {"center_latlon": center_latlon, **stats}
+
+
+def accident_distances(gdf, hotspots, nodes):
+    task_b = _script("TaskB.py")
+    check_node_coverage(nodes, hotspots["center"])
+    gdf_clip = task_b.clip_to_hotspot(gdf, center=hotspots["center"])
+    gdf_clip.loc[:, "nearest_dist"] = task_b.nearest_intersection_distances(gdf_clip, nodes)
+    return gdf_clip
+
+
+def hotspot_moran(gdf_clip):
+    return _script("TaskB.py").moran_stage(gdf_clip)[0]
+
+
+def city_moran(gdf):
+    task_b = _script("TaskB.py")
+    moran_city, lisa_city = task_b.moran_stage(gdf)
+    return moran_city, task_b.lisa_cluster_counts(lisa_city)
+
+
+def taskb_report(gdf_clip, moran, city):
+    task_b = _script("TaskB.py")
+    distances = gdf_clip["nearest_dist"]
+    task_b.write_results(os.path.join(RESULTS_DIR, "Part2_taskb_results.txt"), len(gdf_clip), moran, *city,
+                         distances.mean(), distances.max(), distances.min())
+    task_b.plot_distance_distribution(distances, os.path.join(RESULTS_DIR, "2B_Figure_Distance_Distribution.png"))
+
+
+def hotspot_figure(gdf, hotspots, nodes):
+    _script("TaskB_Hotspot figure.py").plot_hotspot_figure(
+        gdf, nodes, hotspots["center"],
+        os.path.join(RESULTS_DIR, "2B_Accident Distribution and Intersections in Hotspot Area.png"))
+
+
+def ic_graph(nodes, radius=100):
+    return _script("TaskC.py").intersection_graph(nodes, radius=radius)
+
+
+def ic_seeds(graph, gdf, hotspots):
+    return _script("TaskC.py").hotspot_seed_nodes(graph[0], gdf, center=hotspots["center"])
+
+
+def ic_cascade(graph, seed_nodes, p=0.2, max_steps=7, seed=42):
+    return _script("TaskC.py").run_ic_model(graph[1], seed_nodes, p=p, max_steps=max_steps, seed=seed)
+
+
+def ic_influence(graph, seed_nodes, p=0.2, max_steps=7, seed=42):
+    return _script("TaskC.py").influence_summary(graph[1], seed_nodes, p=p, max_steps=max_steps, seed=seed)
+
+
+def taskc_report(graph, timeline, influence):
+    task_c = _script("TaskC.py")
+    task_c.plot_cascade(graph[1], timeline, os.path.join(RESULTS_DIR, "2C_IC_model_propagation.png"))
+    task_c.write_activation_log(os.path.join(RESULTS_DIR, "2C_activation_log.txt"), timeline, *influence)
+
+
+def voronoi_network():
+    return _script("TaskC_voronoi_marathon.py").leeds_network()
+
+
+def voronoi_regions(network, region_mode="euclidean"):
+    return _script("TaskC_voronoi_marathon.py").assign_voronoi_regions(*network, region_mode=region_mode)
+
+
+def voronoi_loops(network, nodes, seed=42):
+    return _script("TaskC_voronoi_marathon.py").region_loops(network[0], nodes, seed=seed)
+
+
+def voronoi_figure(network, nodes, loops_by_region):
+    _script("TaskC_voronoi_marathon.py").plot_voronoi_loops(
+        network[0], nodes, loops_by_region, os.path.join(RESULTS_DIR, "2C_voronoi_marathon_paths_leeds.png"))
+
+
+def part2_stages(nodes_file=None, region_mode="euclidean"):
+    """The Part2 analysis as a stage graph; `nodes_file` reuses an existing network_nodes.geojson."""
+    def results(*names):
+        return tuple(os.path.join(RESULTS_DIR, name) for name in names)
+
+    if nodes_file:
+        # An existing node file fixes the study box to the centre it was extracted around
+        hotspot_params = {"center": nodes_center(nodes_file)}
+        intersections = Stage("intersections", intersection_nodes_from_file, params={"path": nodes_file},
+                              files=(nodes_file,))
+    else:
+        hotspot_params = None
+        intersections = Stage("intersections", intersection_nodes, inputs=("hotspots",),
+                              outputs=(NODES_GEOJSON, nodes_center_path(NODES_GEOJSON)),
+                              modules=("extract_intersections", "osm_graph_store"))
+    return [
+        Stage("accidents", load_accidents, files=(ACCIDENT_CSV,), modules=("accidents",)),
+        Stage("hotspots", find_hotspots, inputs=("accidents",), params=hotspot_params, modules=("hotspots",)),
+        intersections,
+        Stage("hotspot_network", hotspot_network, inputs=("hotspots",),
+              outputs=results("2A_taskd_osmnx_network.png"),
+              modules=("TaskA", "hotspots", "accidents", "osm_graph_store")),
+        Stage("accident_distances", accident_distances, inputs=("accidents", "hotspots", "intersections"),
+              modules=("TaskB", "snapping")),
+        Stage("hotspot_moran", hotspot_moran, inputs=("accident_distances",),
+              modules=("TaskB", "spatial_autocorrelation")),
+        Stage("city_moran", city_moran, inputs=("accidents",), modules=("TaskB", "spatial_autocorrelation")),
+        Stage("taskb_report", taskb_report, inputs=("accident_distances", "hotspot_moran", "city_moran"),
+              outputs=results("Part2_taskb_results.txt", "2B_Figure_Distance_Distribution.png"),
+              modules=("TaskB",), figure=True),
+        Stage("hotspot_figure", hotspot_figure, inputs=("accidents", "hotspots", "intersections"),
+              outputs=results("2B_Accident Distribution and Intersections in Hotspot Area.png"),
+              modules=("TaskB_Hotspot figure",), figure=True),
+        Stage("ic_graph", ic_graph, inputs=("intersections",), modules=("TaskC", "spatial_graph")),
+        Stage("ic_seeds", ic_seeds, inputs=("ic_graph", "accidents", "hotspots"), modules=("TaskC", "snapping")),
+        Stage("ic_cascade", ic_cascade, inputs=("ic_graph", "ic_seeds"), modules=("TaskC", "influence")),
+        Stage("ic_influence", ic_influence, inputs=("ic_graph", "ic_seeds"), modules=("TaskC", "influence")),
+        Stage("taskc_report", taskc_report, inputs=("ic_graph", "ic_cascade", "ic_influence"),
+              outputs=results("2C_IC_model_propagation.png", "2C_activation_log.txt"), modules=("TaskC",),
+              figure=True),
+        Stage("voronoi_network", voronoi_network, modules=("TaskC_voronoi_marathon", "osm_graph_store")),
+        Stage("voronoi_regions", voronoi_regions, inputs=("voronoi_network",), params={"region_mode": region_mode},
+              modules=("TaskC_voronoi_marathon", "voronoi_regions")),
+        Stage("voronoi_loops", voronoi_loops, inputs=("voronoi_network", "voronoi_regions"),
+              modules=("TaskC_voronoi_marathon", "loop_routes")),
+        Stage("voronoi_figure", voronoi_figure, inputs=("voronoi_network", "voronoi_regions", "voronoi_loops"),
+              outputs=results("2C_voronoi_marathon_paths_leeds.png"), modules=("TaskC_voronoi_marathon",),
+              figure=True),
+    ]
+
+
+# === Main execution ===
+def main(targets=None, workers=1, force=(), nodes_file=None, region_mode="euclidean"):
+    pipeline = Pipeline(part2_stages(nodes_file, region_mode))
+    _, report = pipeline.run(targets, workers=workers, force=force)
+    for name, status, seconds in report:
+        print(f"{name:<20} {status:<7} {seconds:8.2f} s")
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the Part2 analysis, re-running only stale stages.")
+    parser.add_argument("targets", nargs="*", help="stages to bring up to date (default: all)")
+    parser.add_argument("--workers", type=int, default=1, help="processes for independent stages")
+    parser.add_argument("--force", nargs="*", default=(), help="stages to re-run even if up to date")
+    parser.add_argument("--nodes-file", help="use this network_nodes.geojson instead of querying OSMnx")
+    parser.add_argument("--region-mode", default="euclidean", choices=("euclidean", "network"))
+    args = parser.parse_args()
+    main(args.targets or None, args.workers, args.force, args.nodes_file, args.region_mode)
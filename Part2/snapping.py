@@ -0,0 +1,48 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+def xy_array(points):
+    """(n, 2) coordinates from a GeoSeries/GeoDataFrame or an array of x, y."""
+    if hasattr(points, "geometry"):
+        points = points.geometry
+    if hasattr(points, "x") and hasattr(points, "y"):
+        return np.column_stack([points.x.to_numpy(), points.y.to_numpy()])
+    return np.asarray(points, dtype=float).reshape(-1, 2)
+
+
+# === Snap many points to network nodes with one spatial index ===
+class NodeSnapper:
+    """Nearest network node(s) for many points at once.
+
+    Build once from a projected node GeoDataFrame (ids come from its index); points
+    passed to `nearest` must be in the same CRS.
+    """
+
+    def __init__(self, nodes_gdf):
+        self.node_ids = nodes_gdf.index.to_numpy()
+        self.tree = cKDTree(xy_array(nodes_gdf))
+
+    def nearest(self, points, k=1, max_distance=np.inf, missing=-1):
+        """Node ids and distances, shape (n,) for k=1 or (n, k) otherwise.
+
+        Neighbours further than `max_distance` get id `missing` and distance inf.
+        """
+        dist, pos = self.tree.query(xy_array(points), k=k, distance_upper_bound=max_distance)
+        found = pos < len(self.node_ids)
+        ids = np.full(pos.shape, missing, dtype=object if self.node_ids.dtype == object else self.node_ids.dtype)
+        ids[found] = self.node_ids[pos[found]]
+        return ids, dist
+
+
+# === Snap points to the nearest edge of an OSMnx graph ===
+def nearest_edges(G, points):
+    """(u, v, key) of the nearest edge and its distance for each point.
+
+    G and the points must share a CRS; a projected graph gives distances in metres.
+    """
+    import osmnx as ox
+
+    xy = xy_array(points)
+    edges, dist = ox.distance.nearest_edges(G, X=xy[:, 0], Y=xy[:, 1], return_dist=True)
+    return edges, np.asarray(dist)
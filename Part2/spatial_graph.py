@@ -0,0 +1,60 @@
+import numpy as np
+import networkx as nx
+from scipy.spatial import cKDTree
+
+
+# === Neighbour pairs from a KD-tree (projected coordinates, metres) ===
+def radius_pairs(coords, radius):
+    """Unique pairs (i < j) closer than `radius`, with their distances."""
+    coords = np.asarray(coords, dtype=float)
+    pairs = cKDTree(coords).query_pairs(radius, output_type='ndarray')
+    dist = np.linalg.norm(coords[pairs[:, 0]] - coords[pairs[:, 1]], axis=1)
+    keep = dist < radius  # strict, like the original pairwise check
+    return pairs[keep], dist[keep]
+
+
+def knn_pairs(coords, k):
+    """Unique pairs linking every point to its k nearest neighbours."""
+    coords = np.asarray(coords, dtype=float)
+    k = min(k, len(coords) - 1)
+    if k < 1:
+        return np.empty((0, 2), dtype=int), np.empty(0)
+    dist, idx = cKDTree(coords).query(coords, k=k + 1)
+    src = np.repeat(np.arange(len(coords)), k)
+    dst = idx[:, 1:].ravel()
+    dist = dist[:, 1:].ravel()
+    pairs = np.column_stack([np.minimum(src, dst), np.maximum(src, dst)])
+    pairs, first = np.unique(pairs, axis=0, return_index=True)
+    return pairs, dist[first]
+
+
+# === Graph construction ===
+def build_spatial_graph(coords, radius=None, k=None, node_ids=None, node_attrs=None):
+    """Undirected graph with edges weighted by distance.
+
+    Connect points within `radius`, or to their `k` nearest neighbours when `k` is
+    given instead. `node_ids` label the points (default 0..n-1) and `node_attrs`
+    is an optional per-point list of attribute dicts.
+    """
+    if (radius is None) == (k is None):
+        raise ValueError("Pass exactly one of radius or k")
+    coords = np.asarray(coords, dtype=float)
+    node_ids = np.arange(len(coords)) if node_ids is None else np.asarray(node_ids)
+    pairs, dist = radius_pairs(coords, radius) if k is None else knn_pairs(coords, k)
+
+    G = nx.Graph()
+    if node_attrs is None:
+        G.add_nodes_from(node_ids.tolist())
+    else:
+        G.add_nodes_from(zip(node_ids.tolist(), node_attrs))
+    G.add_weighted_edges_from(zip(node_ids[pairs[:, 0]].tolist(), node_ids[pairs[:, 1]].tolist(), dist.tolist()))
+    return G
+
+
+def spatial_graph_from_gdf(nodes_gdf, radius=None, k=None):
+    """Spatial graph over a projected point GeoDataFrame, keyed by its index."""
+    xs, ys = nodes_gdf.geometry.x.to_numpy(), nodes_gdf.geometry.y.to_numpy()
+    attrs = [{"osmid": osmid, "x": x, "y": y, "geometry": geom}
+             for osmid, x, y, geom in zip(nodes_gdf["osmid"], xs, ys, nodes_gdf.geometry)]
+    return build_spatial_graph(np.column_stack([xs, ys]), radius=radius, k=k,
+                               node_ids=nodes_gdf.index.to_numpy(), node_attrs=attrs)
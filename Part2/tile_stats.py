@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import networkx as nx
+import shapely
+from concurrent.futures import ProcessPoolExecutor
+from scipy import sparse
+from scipy.spatial import cKDTree
+
+TILE_CHUNK = 64  # tiles per planarity task
+
+
+# === Tiles: a regular grid over the network, or boxes around hotspot centres ===
+def grid_tiles(x, y, tile_size=1000):
+    """Centres of the grid tiles covering the points (projected metres)."""
+    cols = np.arange(np.floor(np.min(x) / tile_size), np.floor(np.max(x) / tile_size) + 1)
+    rows = np.arange(np.floor(np.min(y) / tile_size), np.floor(np.max(y) / tile_size) + 1)
+    cx, cy = np.meshgrid((cols + 0.5) * tile_size, (rows + 0.5) * tile_size)
+    return np.column_stack([cx.ravel(), cy.ravel()])
+
+
+def tile_membership(node_xy, centres, half_size):
+    """Sparse (tiles x nodes) bool matrix: node inside the square of `half_size` around each centre.
+
+    Tiles may overlap (hotspot boxes), so a node can belong to several tiles.
+    """
+    hits = cKDTree(node_xy).query_ball_point(centres, half_size, p=np.inf)
+    rows = np.repeat(np.arange(len(centres)), [len(h) for h in hits])
+    cols = np.concatenate([np.asarray(h, dtype=np.int64) for h in hits]) if len(hits) else np.array([], dtype=np.int64)
+    return sparse.csr_matrix((np.ones(len(rows), dtype=bool), (rows, cols)), shape=(len(centres), len(node_xy)))
+
+
+# === Planarity per tile (the only step that needs a NetworkX graph) ===
+def _planarity(tile_edges):
+    out = []
+    for edges in tile_edges:
+        H = nx.Graph()
+        H.add_edges_from(edges)
+        out.append(nx.check_planarity(H)[0])
+    return out
+
+
+def tile_statistics(G, centres, tile_size=1000, workers=1):
+    """TaskA street-network indicators for every tile of one projected OSMnx graph.
+
+    Each tile is the subgraph induced by the nodes inside its box, as a separate
+    `graph_from_bbox` download would give. Columns follow TaskA: node/edge counts,
+    average street segment length, convex-hull area and node/edge/intersection
+    densities, plus planarity (computed across a process pool).
+    """
+    nodes = list(G.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+    node_xy = np.array([(data["x"], data["y"]) for _, data in G.nodes(data=True)], dtype=float)
+    street_count = np.array([data.get("street_count", 0) for _, data in G.nodes(data=True)])
+    edges = list(G.edges(keys=True, data=True))
+    u = np.array([index[a] for a, _, _, _ in edges], dtype=np.int64)
+    v = np.array([index[b] for _, b, _, _ in edges], dtype=np.int64)
+    key = np.array([k for _, _, k, _ in edges], dtype=np.int64)
+    length = np.array([data.get("length", 0.0) for _, _, _, data in edges], dtype=float)
+    geometry = np.array([data.get("geometry") for _, _, _, data in edges], dtype=object)
+
+    # Tile membership of nodes, and of edges whose two ends lie in the same tile
+    M = tile_membership(node_xy, centres, tile_size / 2).tocsc()
+    T = M[:, u].multiply(M[:, v]).tocoo()
+    tile, edge = T.row, T.col
+    order = np.lexsort((edge, tile))
+    tile, edge = tile[order], edge[order]
+    n_tiles = len(centres)
+
+    n = np.asarray(M.sum(axis=1)).ravel()
+    m = np.bincount(tile, minlength=n_tiles)
+    intersections = np.asarray(M.multiply(street_count[None, :] > 1).sum(axis=1)).ravel()
+
+    # Street segments: reciprocal directed edges count once, as in ox.basic_stats
+    lo, hi = np.minimum(u[edge], v[edge]), np.maximum(u[edge], v[edge])
+    _, first = np.unique(np.column_stack([tile, lo, hi, key[edge]]), axis=0, return_index=True)
+    segments = np.bincount(tile[first], minlength=n_tiles)
+    street_length = np.bincount(tile[first], weights=length[edge[first]], minlength=n_tiles)
+
+    # Convex hull of all edge vertices per tile (straight edges contribute their end nodes)
+    has_geom = np.array([g is not None for g in geometry[edge]], dtype=bool)
+    geom_xy, geom_pair = shapely.get_coordinates(geometry[edge][has_geom], return_index=True)
+    points = np.vstack([node_xy[u[edge]], node_xy[v[edge]], geom_xy])
+    owner = np.concatenate([tile, tile, tile[has_geom][geom_pair]])
+    area_km2 = np.zeros(n_tiles)
+    if len(points):
+        # Hulls only for tiles that own points; tiles without intra-tile edges keep area 0
+        order = np.argsort(owner, kind="stable")
+        present, position = np.unique(owner[order], return_inverse=True)
+        hulls = shapely.convex_hull(shapely.multipoints(points[order], indices=position))
+        area_km2[present] = shapely.area(hulls) / 1e6
+
+    # Planarity across the pool, on each tile's undirected edge list
+    bounds = np.searchsorted(tile, np.arange(n_tiles + 1))
+    tile_edges = [np.column_stack([u[edge[a:b]], v[edge[a:b]]]) for a, b in zip(bounds[:-1], bounds[1:])]
+    chunks = [tile_edges[i:i + TILE_CHUNK] for i in range(0, n_tiles, TILE_CHUNK)]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            planar = [p for chunk in pool.map(_planarity, chunks) for p in chunk]
+    else:
+        planar = [p for chunk in chunks for p in _planarity(chunk)]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        table = pd.DataFrame({
+            "tile": np.arange(n_tiles),
+            "center_x": centres[:, 0],
+            "center_y": centres[:, 1],
+            "n": n,
+            "m": m,
+            "intersection_count": intersections,
+            "street_length_avg": np.where(segments > 0, street_length / segments, np.nan),
+            "area_km2": area_km2,
+            "node_density": np.where(area_km2 > 0, n / area_km2, np.nan),
+            "edge_density": np.where(area_km2 > 0, m / area_km2, np.nan),
+            "intersection_density": np.where(area_km2 > 0, intersections / area_km2, np.nan),
+            "is_planar": planar,
+        })
+    return table[table["n"] > 0].reset_index(drop=True)
@@ -0,0 +1,38 @@
+import numpy as np
+from scipy.spatial import cKDTree
+from scipy.sparse import csgraph
+from snapping import xy_array, NodeSnapper
+from loop_routes import graph_csr
+
+
+# === Euclidean Voronoi: nearest seed by KD-tree on projected coordinates ===
+def assign_regions(points, seed_points):
+    """Index of the nearest seed and the distance to it, for every point.
+
+    Both inputs must be in the same projected CRS (GeoSeries/GeoDataFrame or x, y arrays).
+    """
+    dist, region = cKDTree(xy_array(seed_points)).query(xy_array(points))
+    return region, dist
+
+
+# === Network Voronoi: multi-source Dijkstra over the road graph ===
+def network_regions(G, nodes_gdf, seed_points, directed=False):
+    """Region of every graph node by road distance to the nearest seed.
+
+    Seeds are snapped to their nearest node in the projected `nodes_gdf` (indexed by
+    node id, same CRS as `seed_points`). Nodes no seed can reach get region -1.
+    Returns (regions aligned with nodes_gdf.index, network distance in metres).
+    """
+    nodes, A = graph_csr(G)
+    index = {node: i for i, node in enumerate(nodes)}
+    seed_nodes, _ = NodeSnapper(nodes_gdf).nearest(seed_points)
+    sources = np.array([index[s] for s in seed_nodes])
+
+    dist, _, nearest = csgraph.dijkstra(A, directed=directed, indices=sources, min_only=True,
+                                        return_predecessors=True)
+    region_of_source = np.full(len(nodes), -1)
+    region_of_source[sources[::-1]] = np.arange(len(sources))[::-1]  # first seed wins on a shared node
+    region = np.where(nearest >= 0, region_of_source[np.maximum(nearest, 0)], -1)
+
+    order = np.array([index[node] for node in nodes_gdf.index])
+    return region[order], dist[order]
@@ -0,0 +1,207 @@
+import os
+import sys
+import gc
+import json
+import time
+import platform
+import argparse
+import tracemalloc
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT, "Part1"), os.path.join(ROOT, "Part2")]
+
+import synthetic
+from editor_network import stream_threads, cooccurrence_from_codes
+from path_metrics import largest_component, exact_diameter, sampled_path_length
+from null_models import average_clustering
+from centrality import top_k_priority
+from epidemic import sir_ensemble
+from spatial_graph import build_spatial_graph
+from influence import simulate_ic
+from snapping import NodeSnapper
+from accidents import build_tables
+from spatial_autocorrelation import distance_band_weights, global_moran, local_moran
+from loop_routes import best_loops
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SEED = 42
+
+
+# === Shared synthetic inputs (generated once per scale) ===
+@lru_cache(maxsize=None)
+def discussion_csv(scale):
+    return synthetic.write_csv(synthetic.discussion_frame, DATA_DIR, "discussion", scale)
+
+
+@lru_cache(maxsize=None)
+def editor_network(scale):
+    return cooccurrence_from_codes(*stream_threads(discussion_csv(scale)))
+
+
+@lru_cache(maxsize=None)
+def accident_xy(scale):
+    path = synthetic.write_csv(synthetic.accident_frame, DATA_DIR, "accidents", scale)
+    accidents, _ = build_tables(pd.read_csv(path))
+    return accidents[["Grid Ref: Easting", "Grid Ref: Northing"]].to_numpy(dtype=float)
+
+
+@lru_cache(maxsize=None)
+def street_graph(scale):
+    return synthetic.street_graph(scale)
+
+
+# === Stages: each returns (zero-argument callable to measure, input sizes) ===
+def stage_graph_build(scale):
+    path = discussion_csv(scale)
+    rows = sum(1 for _ in open(path, encoding="utf-8")) - 1
+    return lambda: cooccurrence_from_codes(*stream_threads(path)), {"rows": rows}
+
+
+def stage_taskb_metrics(scale):
+    A, _ = editor_network(scale)
+
+    def run():
+        A_cc, _, _ = largest_component(A)
+        sampled_path_length(A_cc, n_sources=300, seed=SEED)
+        exact_diameter(A_cc)
+        average_clustering(A)
+    return run, {"nodes": A.shape[0], "edges": A.nnz // 2}
+
+
+def stage_centrality(scale):
+    A, names = editor_network(scale)
+    return lambda: top_k_priority(A, names, k=10, epsilon=0.05, seed=SEED), {"nodes": A.shape[0], "edges": A.nnz // 2}
+
+
+def stage_sir(scale):
+    A, _ = editor_network(scale)
+    initial = np.argsort(-np.diff(A.indptr))[:1]
+    return (lambda: sir_ensemble(A, initial, beta=0.3, gamma=0.1, steps=10, runs=200, seed=SEED),
+            {"nodes": A.shape[0], "edges": A.nnz // 2})
+
+
+def stage_ic(scale):
+    coords = synthetic.intersection_points(scale)
+    G = build_spatial_graph(coords, radius=100)
+    seeds = list(range(min(10, len(coords))))
+    return (lambda: simulate_ic(G, seeds, p=0.2, runs=1000, max_steps=7, seed=SEED),
+            {"nodes": G.number_of_nodes(), "edges": G.number_of_edges()})
+
+
+def stage_snapping(scale):
+    G = street_graph(scale)
+    xy = np.array([(d["x"], d["y"]) for _, d in G.nodes(data=True)])
+    nodes = gpd.GeoDataFrame(geometry=gpd.points_from_xy(xy[:, 0], xy[:, 1]), index=list(G.nodes()), crs="EPSG:27700")
+    points = accident_xy(scale)
+    return lambda: NodeSnapper(nodes).nearest(points), {"nodes": len(nodes), "points": len(points)}
+
+
+def stage_moran(scale, permutations=199):
+    xy = accident_xy(scale)
+
+    def run():
+        W = distance_band_weights(xy, threshold=200)
+        global_moran(xy[:, 0], W, permutations=permutations, seed=SEED)
+        local_moran(xy[:, 0], W, permutations=permutations, seed=SEED)
+    return run, {"points": len(xy), "permutations": permutations}
+
+
+def stage_loop_search(scale):
+    G = street_graph(scale)
+    starts = list(np.random.default_rng(SEED).choice(list(G.nodes()), 8, replace=False))
+    return (lambda: best_loops(G, starts, target_km=42, n_best=1, seed=SEED),
+            {"nodes": G.number_of_nodes(), "edges": G.number_of_edges()})
+
+
+STAGES = {
+    "graph_build": stage_graph_build,
+    "taskb_metrics": stage_taskb_metrics,
+    "centrality": stage_centrality,
+    "sir": stage_sir,
+    "ic": stage_ic,
+    "snapping": stage_snapping,
+    "moran": stage_moran,
+    "loop_search": stage_loop_search,
+}
+
+
+# === Measurement ===
+def measure(fn, repeats=3):
+    """Best-of-`repeats` wall and CPU time, then one extra run under tracemalloc for peak memory."""
+    wall, cpu = [], []
+    for _ in range(repeats):
+        gc.collect()
+        w0, c0 = time.perf_counter(), time.process_time()
+        fn()
+        wall.append(time.perf_counter() - w0)
+        cpu.append(time.process_time() - c0)
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"wall_s": min(wall), "cpu_s": min(cpu), "peak_mb": peak / 1024 ** 2}
+
+
+def compare(results, baseline, tolerance):
+    """Rows of (stage, scale, wall, baseline wall, ratio, regressed) for stages present in both runs."""
+    base = {(r["stage"], r["scale"]): r for r in baseline["results"]}
+    rows = []
+    for r in results:
+        b = base.get((r["stage"], r["scale"]))
+        if b is None:
+            continue
+        ratio = r["wall_s"] / b["wall_s"] if b["wall_s"] > 0 else np.inf
+        rows.append({"stage": r["stage"], "scale": r["scale"], "wall_s": r["wall_s"], "baseline_s": b["wall_s"],
+                     "ratio": ratio, "peak_mb": r["peak_mb"], "baseline_mb": b["peak_mb"],
+                     "regressed": bool(ratio > 1 + tolerance)})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time and memory-profile the Part1/Part2 stages on synthetic data")
+    parser.add_argument("--scales", type=float, nargs="+", default=[1, 10, 100],
+                        help="multiples of the shipped dataset sizes")
+    parser.add_argument("--stages", nargs="+", choices=sorted(STAGES), default=list(STAGES))
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", default=BASELINE, help="earlier results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before flagging (0.25 = 25%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="write these results as the new baseline")
+    args = parser.parse_args()
+
+    results = []
+    for scale in args.scales:
+        for name in args.stages:
+            fn, sizes = STAGES[name](scale)
+            record = {"stage": name, "scale": scale, "sizes": sizes, **measure(fn, args.repeats)}
+            results.append(record)
+            print(f"{name:>14} x{scale:<5g} wall {record['wall_s']:8.3f} s  cpu {record['cpu_s']:8.3f} s  "
+                  f"peak {record['peak_mb']:9.1f} MB  {sizes}", flush=True)
+
+    report = {
+        "meta": {"python": platform.python_version(), "numpy": np.__version__, "platform": platform.platform(),
+                 "cpus": os.cpu_count(), "time": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": results,
+    }
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            report["comparison"] = compare(results, json.load(f), args.tolerance)
+        regressed = [r for r in report["comparison"] if r["regressed"]]
+        for r in report["comparison"]:
+            flag = "REGRESSION" if r["regressed"] else "ok"
+            print(f"{r['stage']:>14} x{r['scale']:<5g} {r['ratio']:6.2f}x baseline  {flag}")
+        report["regressions"] = len(regressed)
+
+    with open(args.baseline if args.save_baseline else args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
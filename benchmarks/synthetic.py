@@ -0,0 +1,113 @@
+import os
+import numpy as np
+import pandas as pd
+import networkx as nx
+
+# Shipped sizes that scale = 1 reproduces
+DISCUSSION_ROWS = 48551      # PROJECT_CHAT.csv
+ROWS_PER_THREAD = 3.15
+ROWS_PER_USER = 11.7
+ACCIDENTS = 1450             # Traffic_accidents_2019_Leeds.csv (1907 casualty rows)
+INTERSECTIONS_PER_KM2 = 75   # network_nodes.geojson, 1 km hotspot box
+STREET_GRID = 100            # nodes per side of the street grid used for loop search
+
+
+# === Discussion CSV: thread_subject, username, page_name ===
+def discussion_frame(scale=1, seed=0):
+    """Poisson-sized threads, Zipf-like user activity and monthly archive pages."""
+    rng = np.random.default_rng(seed)
+    n_rows = int(DISCUSSION_ROWS * scale)
+    n_threads = int(n_rows / ROWS_PER_THREAD)
+    n_users = int(n_rows / ROWS_PER_USER)
+
+    thread = np.sort(rng.integers(0, n_threads, n_rows))
+    popularity = 1.0 / np.arange(1, n_users + 1) ** 1.1
+    user = rng.choice(n_users, n_rows, p=popularity / popularity.sum())
+    month = (thread * 110 // n_threads)  # threads are archived in order, ~110 months
+    year, month = 2012 + (month + 9) // 12, (month + 9) % 12 + 1
+    return pd.DataFrame({
+        "thread_subject": np.char.add("Topic ", thread.astype(str)),
+        "username": np.char.add("User", user.astype(str)),
+        "page_name": [f"WikidataProjectchatArchive{y}{m:02d}.json" for y, m in zip(year, month)],
+    })
+
+
+# === Accident CSV with the Leeds schema (one row per casualty) ===
+def accident_frame(scale=1, seed=0):
+    """Accidents clustered around a few centres over the Leeds extent, 1-3 casualties each."""
+    rng = np.random.default_rng(seed)
+    n = int(ACCIDENTS * scale)
+    centres = np.array([[430500, 433500], [429000, 436000], [433000, 431000], [426000, 434000]])
+    clustered = rng.random(n) < 0.6
+    xy = np.column_stack([rng.uniform(418000, 446000, n), rng.uniform(424000, 446000, n)])
+    pick = centres[rng.integers(0, len(centres), n)]
+    xy[clustered] = pick[clustered] + rng.normal(0, 700, (clustered.sum(), 2))
+    xy = np.round(xy)
+
+    casualties = rng.choice([1, 2, 3], n, p=[0.75, 0.2, 0.05])
+    a = np.repeat(np.arange(n), casualties)
+    days = rng.integers(0, 365, n)
+    dates = pd.Timestamp("2019-01-01") + pd.to_timedelta(days, unit="D")
+    road_class = rng.integers(1, 7, n)
+    return pd.DataFrame({
+        "Reference Number": np.char.add("5", np.arange(n).astype(str))[a],
+        "Grid Ref: Easting": xy[a, 0].astype(int),
+        "Grid Ref: Northing": xy[a, 1].astype(int),
+        "Number of Vehicles": rng.integers(1, 4, n)[a],
+        "Accident Date": dates.strftime("%d/%m/%Y").to_numpy()[a],
+        "Time (24hr)": (rng.integers(0, 24, n) * 100 + rng.integers(0, 60, n))[a],
+        "1st Road Class": road_class[a],
+        "1st Road Class & No": np.char.add("A", rng.integers(58, 6120, n).astype(str))[a],
+        "Road Surface": rng.integers(1, 4, n)[a],
+        "Lighting Conditions": rng.integers(1, 6, n)[a],
+        "Weather Conditions": rng.integers(1, 9, n)[a],
+        "Local Authority": "E08000035",
+        "Vehicle Number": rng.integers(1, 3, len(a)),
+        "Type of Vehicle": rng.choice([1, 9, 11, 19], len(a)),
+        "Casualty Class": rng.integers(1, 4, len(a)),
+        "Casualty Severity": rng.choice([1, 2, 3], len(a), p=[0.02, 0.18, 0.8]),
+        "Sex of Casualty": rng.integers(1, 3, len(a)),
+        "Age of Casualty": rng.integers(1, 90, len(a)),
+    })
+
+
+def write_csv(frame_fn, data_dir, name, scale=1, seed=0):
+    """Generate once per (name, scale, seed) into `data_dir` and return the path."""
+    path = os.path.join(data_dir, f"{name}_x{scale:g}_s{seed}.csv")
+    if not os.path.exists(path):
+        os.makedirs(data_dir, exist_ok=True)
+        frame_fn(scale, seed).to_csv(path + ".tmp", index=False)
+        os.replace(path + ".tmp", path)
+    return path
+
+
+# === Point and street layers ===
+def intersection_points(scale=1, seed=0):
+    """Intersection-like points at the hotspot density over a (scale) km^2 square."""
+    rng = np.random.default_rng(seed)
+    side = 1000 * np.sqrt(scale)
+    n = int(INTERSECTIONS_PER_KM2 * scale)
+    return np.column_stack([430000 + rng.uniform(0, side, n), 433000 + rng.uniform(0, side, n)])
+
+
+def street_graph(scale=1, seed=0, spacing=150.0):
+    """OSMnx-like MultiDiGraph: jittered grid, two-way streets with a few one-ways, `length` in metres."""
+    rng = np.random.default_rng(seed)
+    side = int(STREET_GRID * np.sqrt(scale))
+    ij = np.array([(i, j) for i in range(side) for j in range(side)])
+    xy = 420000 + ij * spacing + rng.normal(0, spacing / 8, ij.shape)
+
+    G = nx.MultiDiGraph(crs="EPSG:27700")
+    G.add_nodes_from((k, {"x": x, "y": y, "street_count": 4}) for k, (x, y) in enumerate(xy))
+    right = np.flatnonzero(ij[:, 0] < side - 1)
+    up = np.flatnonzero(ij[:, 1] < side - 1)
+    u = np.concatenate([right, up])
+    v = np.concatenate([right + side, up + 1])
+    keep = rng.random(len(u)) > 0.05  # a few missing streets
+    u, v = u[keep], v[keep]
+    length = np.linalg.norm(xy[u] - xy[v], axis=1)
+    one_way = rng.random(len(u)) < 0.1
+    G.add_edges_from((a, b, {"length": w}) for a, b, w in zip(u.tolist(), v.tolist(), length.tolist()))
+    G.add_edges_from((b, a, {"length": w}) for a, b, w, o in zip(u.tolist(), v.tolist(), length.tolist(), one_way)
+                     if not o)
+    return G
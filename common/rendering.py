@@ -0,0 +1,99 @@
+import os
+import json
+import hashlib
+import numpy as np
+import matplotlib
+
+# Scripts render straight to PNG; set SHOW_FIGURES=1 for interactive windows
+SHOW = os.environ.get("SHOW_FIGURES") == "1"
+if not SHOW:
+    matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.colors import LogNorm
+
+DENSITY_EDGES = 200_000  # density="auto" switches to a raster above this many edges
+LAYOUT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "layouts")
+
+
+def show(fig=None):
+    """`plt.show()` when SHOW_FIGURES=1, otherwise just release the figure."""
+    if SHOW:
+        plt.show()
+    else:
+        plt.close(fig if fig is not None else "all")
+
+
+# === Array form of a graph: one coordinate row per node, one segment per edge ===
+def graph_arrays(G, pos=None, x="x", y="y"):
+    """(node ids, (n, 2) coordinates, (m, 2, 2) edge segments) from `pos` or the nodes' x / y attributes."""
+    nodes = list(G.nodes)
+    if pos is None:
+        xy = np.array([(d[x], d[y]) for _, d in G.nodes(data=True)], dtype=float).reshape(-1, 2)
+    else:
+        xy = np.array([pos[n] for n in nodes], dtype=float).reshape(-1, 2)
+    index = {n: i for i, n in enumerate(nodes)}
+    edges = np.array([(index[u], index[v]) for u, v in G.edges()], dtype=np.int64).reshape(-1, 2)
+    return nodes, xy, xy[edges]
+
+
+def line_segments(geometries):
+    """(k, 2, 2) segments of a sequence of LineStrings (e.g. OSMnx edge geometries), curves included."""
+    import shapely
+    coords, owner = shapely.get_coordinates(np.asarray(geometries), return_index=True)
+    same = owner[1:] == owner[:-1]
+    return np.stack([coords[:-1][same], coords[1:][same]], axis=1)
+
+
+# === Drawing: one LineCollection for the edges, one scatter for the nodes ===
+def draw_density(ax, segments, bins=1024, cmap="magma"):
+    """Edge length per pixel as a single image, for graphs too large to draw line by line."""
+    start, delta = segments[:, 0], segments[:, 1] - segments[:, 0]
+    length = np.hypot(delta[:, 0], delta[:, 1])
+    extent = np.ptp(segments.reshape(-1, 2), axis=0).max() or 1.0
+    # Sample each segment about once per pixel so long edges spread over the pixels they cross
+    k = np.maximum(1, np.ceil(length * bins / extent)).astype(np.int64)
+    owner = np.repeat(np.arange(len(segments)), k)
+    t = (np.arange(k.sum()) - np.repeat(np.cumsum(k) - k, k) + 0.5) / k[owner]
+    points = start[owner] + t[:, None] * delta[owner]
+    density, xe, ye = np.histogram2d(points[:, 0], points[:, 1], bins=bins, weights=(length / k)[owner])
+    density = np.ma.masked_equal(density.T, 0)
+    return ax.imshow(density, origin="lower", extent=(xe[0], xe[-1], ye[0], ye[-1]), cmap=cmap,
+                     norm=LogNorm(), interpolation="nearest", aspect="auto")
+
+
+def draw_graph(ax, xy, segments, node_color="C0", node_size=20, edge_color="gray", edge_alpha=0.3,
+               linewidth=0.5, density=False, bins=1024, **scatter_kw):
+    """Edges and nodes from array coordinates; `density` (True / "auto") rasterizes the edges instead."""
+    if density == "auto":
+        density = len(segments) > DENSITY_EDGES
+    if density:
+        draw_density(ax, segments, bins=bins)
+    elif len(segments):
+        ax.add_collection(LineCollection(segments, colors=edge_color, alpha=edge_alpha, linewidths=linewidth))
+    nodes = None
+    if node_size and len(xy):
+        nodes = ax.scatter(xy[:, 0], xy[:, 1], s=node_size, c=node_color, zorder=2, **scatter_kw)
+    ax.autoscale_view()
+    return nodes
+
+
+# === Layouts computed once per graph and stored ===
+def cached_layout(G, layout=None, cache_dir=LAYOUT_CACHE_DIR, **kwargs):
+    """Node positions from `layout` (default `nx.spring_layout`), keyed by graph structure and arguments."""
+    import networkx as nx
+    layout = layout or nx.spring_layout
+    nodes = list(G.nodes)
+    h = hashlib.sha1(f"{layout.__module__}.{layout.__name__}".encode())
+    h.update(json.dumps(kwargs, sort_keys=True, default=str).encode())
+    h.update(repr(nodes).encode())
+    h.update(repr(list(G.edges())).encode())
+    path = os.path.join(cache_dir, h.hexdigest() + ".npy")
+    if os.path.exists(path):
+        xy = np.load(path)
+    else:
+        pos = layout(G, **kwargs)
+        xy = np.array([pos[n] for n in nodes], dtype=float).reshape(-1, 2)
+        os.makedirs(cache_dir, exist_ok=True)
+        np.save(path, xy)
+    return dict(zip(nodes, xy))
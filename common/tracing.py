@@ -0,0 +1,132 @@
+import os
+import sys
+import json
+import time
+import atexit
+import cProfile
+import threading
+from contextlib import contextmanager
+from functools import wraps
+
+try:
+    import resource
+except ImportError:  # Windows: no peak RSS
+    resource = None
+
+# Set TRACE_STAGES=<dir> to record stages; TRACE_PROFILE=1 also dumps a cProfile file per stage
+TRACE_DIR = os.environ.get("TRACE_STAGES")
+PROFILE = TRACE_DIR is not None and os.environ.get("TRACE_PROFILE") == "1"
+
+_events = []
+_counts = {}
+_profiling = False
+_origin = time.perf_counter()
+
+
+# === Input sizes: nodes / edges / rows of whatever a stage receives or returns ===
+def describe(obj):
+    """Size summary of a graph, sparse matrix, table or sequence (first element of a tuple)."""
+    if isinstance(obj, tuple) and obj:
+        obj = obj[0]
+    if hasattr(obj, "number_of_nodes"):
+        return {"nodes": obj.number_of_nodes(), "edges": obj.number_of_edges()}
+    if hasattr(obj, "nnz") and len(getattr(obj, "shape", ())) == 2:
+        return {"nodes": int(obj.shape[0]), "nnz": int(obj.nnz)}
+    if hasattr(obj, "shape") and hasattr(obj, "columns"):
+        return {"rows": int(obj.shape[0])}
+    if hasattr(obj, "__len__") and not isinstance(obj, (str, bytes, dict)):
+        return {"items": len(obj)}
+    return {}
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KiB on Linux
+
+
+# === Stage recording ===
+class _Stage:
+    def __init__(self, name, sizes):
+        self.name, self.sizes = name, dict(sizes)
+
+    def record(self, **sizes):
+        self.sizes.update(sizes)
+
+
+@contextmanager
+def stage(name, **sizes):
+    """Time a block as one named stage; `.record(nodes=..., rows=...)` adds input sizes."""
+    if TRACE_DIR is None:
+        yield _Stage(name, sizes)
+        return
+    global _profiling
+    current = _Stage(name, sizes)
+    profiler = None
+    if PROFILE and not _profiling:  # one profiler at a time; nested stages share the outer one
+        profiler, _profiling = cProfile.Profile(), True
+        profiler.enable()
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield current
+    finally:
+        end, cpu = time.perf_counter(), time.process_time() - cpu
+        count = _counts[name] = _counts.get(name, 0) + 1
+        args = {"cpu_s": round(cpu, 6), "peak_rss_mb": _peak_rss_mb(), **current.sizes}
+        if profiler is not None:
+            profiler.disable()
+            _profiling = False
+            path = os.path.join(TRACE_DIR, f"{name}-{os.getpid()}-{count}.prof")
+            profiler.dump_stats(path)
+            args["profile"] = path
+        _events.append({"name": name, "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+                        "ts": (wall - _origin) * 1e6, "dur": (end - wall) * 1e6, "args": args})
+
+
+def traced(name=None, sizes=describe):
+    """Decorator form of `stage`; returns the function unchanged when tracing is off.
+
+    `sizes` maps the first positional argument (or, if there is none, the result) to input sizes.
+    """
+    def decorate(fn):
+        if TRACE_DIR is None:
+            return fn
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(name or fn.__name__) as current:
+                if args:
+                    current.record(**sizes(args[0]))
+                result = fn(*args, **kwargs)
+                if not args:
+                    current.record(**sizes(result))
+                return result
+        return wrapper
+    return decorate
+
+
+# === Chrome trace output (open in chrome://tracing or Perfetto) ===
+def write_trace(path=None):
+    if TRACE_DIR is None or not _events:
+        return None
+    os.makedirs(TRACE_DIR, exist_ok=True)
+    script = os.path.splitext(os.path.basename(sys.argv[0] or "python"))[0]
+    path = path or os.path.join(TRACE_DIR, f"trace-{script}-{os.getpid()}.json")
+    with open(path, "w") as f:
+        json.dump({"traceEvents": _events, "displayTimeUnit": "ms"}, f, default=str)
+    return path
+
+
+def _after_fork():
+    # Forked pool workers start an empty timeline; they call write_trace() themselves,
+    # since worker processes do not run atexit handlers
+    _events.clear()
+    _counts.clear()
+
+
+if TRACE_DIR is not None:
+    os.makedirs(TRACE_DIR, exist_ok=True)
+    atexit.register(write_trace)
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_after_fork)
@@ -0,0 +1,8 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The analysis scripts import their helper modules as siblings
+for folder in ("Part1", "Part2", ""):
+    sys.path.insert(0, os.path.join(ROOT, folder))
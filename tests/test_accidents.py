@@ -0,0 +1,12 @@
+import os
+import pandas as pd
+from accidents import save_tables, load_tables
+
+
+def test_first_published_tables_win(tmp_path):
+    entry = str(tmp_path / "key")
+    save_tables({"accidents": pd.DataFrame({"n": [1, 2]})}, entry)
+    save_tables({"accidents": pd.DataFrame({"n": [3]})}, entry)
+
+    assert load_tables(entry)["accidents"]["n"].tolist() == [1, 2]
+    assert os.listdir(tmp_path) == ["key"]
@@ -0,0 +1,38 @@
+import tracemalloc
+import numpy as np
+import pandas as pd
+import networkx as nx
+from bipartite import BipartiteEditorNetwork
+from editor_network import build_editor_network
+
+
+def _posts(n_posts, n_users, n_threads, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "page_name": "Page",
+        "thread_subject": [f"t{t}" for t in rng.integers(0, n_threads, n_posts)],
+        "username": [f"u{u}" for u in rng.integers(0, n_users, n_posts)],
+    })
+
+
+def test_local_clustering_matches_networkx():
+    df = _posts(600, 120, 60)
+    net = BipartiteEditorNetwork(df)
+    expected = nx.clustering(build_editor_network(df))
+    users = np.arange(net.n_users)
+    np.testing.assert_allclose(net.local_clustering(users), [expected[u] for u in net.usernames[users]])
+
+
+def test_local_clustering_does_not_expand_a_huge_thread():
+    df = _posts(10_000, 6_000, 2_000, seed=1)
+    df.loc[:3999, "thread_subject"] = "huge"
+    df.loc[:3999, "username"] = [f"big{i}" for i in range(4000)]
+    net = BipartiteEditorNetwork(df)
+
+    tracemalloc.start()
+    clustering = net.local_clustering(np.arange(5))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    assert np.all((clustering >= 0) & (clustering <= 1))
+    assert peak < 100 * 1024 ** 2
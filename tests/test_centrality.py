@@ -0,0 +1,16 @@
+import numpy as np
+from centrality import top_k_separated
+
+
+def test_separation_checks_every_top_k_interval():
+    # Rank 1 has the widest interval and overlaps the challenger; rank k (2) alone is clear of it
+    score = np.array([1.0, 0.8, 0.5])
+    bound = np.array([1.0, 0.1, 0.1])
+    assert not top_k_separated(score, bound, k=2)
+
+    bound[0] = 0.2
+    assert top_k_separated(score, bound, k=2)
+
+
+def test_separation_needs_a_challenger():
+    assert not top_k_separated(np.array([0.3, 0.2]), np.zeros(2), k=2)
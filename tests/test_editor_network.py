@@ -0,0 +1,23 @@
+import pandas as pd
+from editor_network import build_cooccurrence, encode_threads, stream_threads, cooccurrence_from_codes
+
+COLUMNS = ["page_name", "thread_subject", "username"]
+
+
+def test_empty_discussion_gives_empty_network(tmp_path):
+    empty = pd.DataFrame(columns=COLUMNS)
+    assert encode_threads(empty)[2] == 0
+
+    A, usernames = build_cooccurrence(empty)
+    assert A.shape == (0, 0) and len(usernames) == 0
+
+    path = tmp_path / "empty.csv"
+    empty.to_csv(path, index=False)
+    A, usernames = cooccurrence_from_codes(*stream_threads(path))
+    assert A.shape == (0, 0) and len(usernames) == 0
+
+
+def test_rows_without_a_thread_are_ignored():
+    df = pd.DataFrame({"page_name": [None, None], "thread_subject": ["a", "a"], "username": ["u", "v"]})
+    A, usernames = build_cooccurrence(df)
+    assert A.shape == (0, 0) and len(usernames) == 0
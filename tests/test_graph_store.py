@@ -0,0 +1,38 @@
+import os
+import time
+import numpy as np
+from scipy import sparse
+from graph_store import save_network, load_network, evict, TMP_MAX_AGE
+
+
+def _network(weight):
+    A = sparse.csr_matrix(np.array([[0, weight], [weight, 0]]))
+    return A, np.array(["alice", "bob"], dtype=object)
+
+
+def test_first_published_entry_wins(tmp_path):
+    save_network("key", *_network(1), cache_dir=tmp_path)
+    save_network("key", *_network(2), cache_dir=tmp_path)
+
+    A, usernames = load_network("key", cache_dir=tmp_path)
+    assert A[0, 1] == 1
+    assert sorted(os.listdir(tmp_path)) == ["key"]
+
+
+def test_evict_removes_abandoned_tmp_dirs(tmp_path):
+    stale, fresh = tmp_path / "old.123.tmp", tmp_path / "new.456.tmp"
+    stale.mkdir()
+    fresh.mkdir()
+    past = time.time() - TMP_MAX_AGE - 60
+    os.utime(stale, (past, past))
+
+    evict(cache_dir=tmp_path)
+
+    assert sorted(os.listdir(tmp_path)) == ["new.456.tmp"]
+
+
+def test_entry_evicted_while_loading_is_a_miss(tmp_path):
+    save_network("key", *_network(1), cache_dir=tmp_path)
+    os.remove(tmp_path / "key" / "indices.npy")  # another process's evict is halfway through rmtree
+
+    assert load_network("key", cache_dir=tmp_path) is None
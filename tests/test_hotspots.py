@@ -0,0 +1,18 @@
+import numpy as np
+import geopandas as gpd
+from hotspots import GEOJSON_CENTER, hotspot_center, nodes_center, save_nodes_center
+
+
+def test_hotspot_center_is_the_densest_cell():
+    rng = np.random.default_rng(0)
+    x = np.concatenate([rng.uniform(0, 5000, 200), rng.uniform(3000, 4000, 300)])
+    y = np.concatenate([rng.uniform(0, 5000, 200), rng.uniform(1000, 2000, 300)])
+    gdf = gpd.GeoDataFrame(geometry=gpd.points_from_xy(x, y), crs="EPSG:27700")
+    assert hotspot_center(gdf) == (3500.0, 1500.0)
+
+
+def test_node_files_without_a_recorded_centre_use_the_geojson_fallback(tmp_path):
+    path = str(tmp_path / "network_nodes.geojson")
+    assert nodes_center(path) == GEOJSON_CENTER
+    save_nodes_center(path, (430500, 433500))
+    assert nodes_center(path) == (430500.0, 433500.0)
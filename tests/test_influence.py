@@ -0,0 +1,16 @@
+import numpy as np
+import networkx as nx
+from influence import InfluenceOracle
+
+
+def test_reach_cache_stays_within_its_byte_budget():
+    G = nx.grid_2d_graph(20, 20)
+    budget = 3000  # a reach set is runs * nodes / 8 = 1000 bytes packed
+    oracle = InfluenceOracle(G, p=0.3, runs=20, seed=0, max_cache_bytes=budget)
+    unbounded = InfluenceOracle(G, p=0.3, runs=20, seed=0)
+
+    for v in range(50):
+        np.testing.assert_array_equal(oracle.reach(v), unbounded.reach(v))
+        assert oracle._cache_bytes <= budget
+    assert len(oracle._cache) == 3
+    assert oracle._cache_bytes == sum(packed.nbytes for packed in oracle._cache.values())
@@ -0,0 +1,10 @@
+import numpy as np
+import networkx as nx
+from null_models import average_clustering, gnm_graph
+
+
+def test_average_clustering_of_a_dense_replicate_matches_networkx():
+    # 400 nodes at 75% density: pairs share ~225 neighbours, past the int8 range
+    A = gnm_graph(400, 59_850, np.random.default_rng(0))
+    expected = nx.average_clustering(nx.from_scipy_sparse_array(A))
+    assert np.isclose(average_clustering(A), expected)
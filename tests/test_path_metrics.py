@@ -0,0 +1,12 @@
+import numpy as np
+import networkx as nx
+from path_metrics import exact_diameter, sampled_path_length
+
+
+def test_every_source_sampled_gives_the_exact_path_length():
+    G = nx.connected_watts_strogatz_graph(500, 4, 0.1, seed=1)
+    A = nx.to_scipy_sparse_array(G, format="csr")
+    result = sampled_path_length(A, n_sources=500, seed=0)  # several BFS blocks
+    assert np.isclose(result["mean"], nx.average_shortest_path_length(G))
+    assert result["ci_low"] == result["ci_high"]
+    assert exact_diameter(A) == nx.diameter(G)
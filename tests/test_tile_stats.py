@@ -0,0 +1,33 @@
+import numpy as np
+import networkx as nx
+from tile_stats import tile_statistics
+
+
+def _street_graph(clusters):
+    """Projected MultiDiGraph: one bidirectional 3-node path per cluster of (x, y) points."""
+    G = nx.MultiDiGraph()
+    for points in clusters:
+        ids = [G.number_of_nodes() + i for i in range(len(points))]
+        for node, (x, y) in zip(ids, points):
+            G.add_node(node, x=x, y=y, street_count=3)
+        for a, b in zip(ids[:-1], ids[1:]):
+            length = float(np.hypot(G.nodes[a]["x"] - G.nodes[b]["x"], G.nodes[a]["y"] - G.nodes[b]["y"]))
+            G.add_edge(a, b, length=length)
+            G.add_edge(b, a, length=length)
+    return G
+
+
+def test_tiles_without_edges_before_the_last_tile():
+    G = _street_graph([
+        [(100, 100), (400, 100), (400, 400)],          # tile 0
+        [(2100, 100), (2400, 100), (2400, 400)],       # tile 2
+    ])
+    G.add_node("lonely", x=1500, y=500, street_count=1)  # tile 1: a node but no edges
+    centres = np.array([[500, 500], [1500, 500], [2500, 500], [3500, 500]])  # tile 3 is empty
+
+    table = tile_statistics(G, centres, tile_size=1000)
+
+    assert table["tile"].tolist() == [0, 1, 2]
+    assert table["m"].tolist() == [4, 0, 4]
+    np.testing.assert_allclose(table["area_km2"], [0.045, 0.0, 0.045])
+    assert np.isnan(table.loc[1, "node_density"])